@@ -0,0 +1,31 @@
+# ======================================================
+# 🧭 WZ SALES TOOLS — MULTIPAGE ENTRY POINT
+# ======================================================
+# The performance table, the commission scorecard and the commission
+# calculator as one Streamlit app, so they share one warm process: modules,
+# background jobs (jobs.py) and the upload store with its parse cache
+# (upload_store.py) are loaded once and reused by every page and session. An
+# export uploaded on one page is picked up by the others.
+#
+# Only streamlit and the plain auth / menu modules are imported here, so the
+# login screen comes up without paying for pandas / NumPy; each page pulls
+# those in the first time it is opened, and openpyxl only loads when an
+# Excel report is downloaded. Page titles come from menu.py.
+#
+#   streamlit run app.py
+
+import streamlit as st
+
+import auth
+import menu
+
+st.set_page_config(page_title="WZ Sales Tools", page_icon="📊", layout="wide")
+
+auth.require_login()
+
+PAGES = [
+    st.Page(page['path'], title=page['title'], icon=page['icon'], default=name == menu.DEFAULT_PAGE)
+    for name, page in menu.PAGES.items()
+]
+
+st.navigation(PAGES).run()
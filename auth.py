@@ -0,0 +1,72 @@
+# ======================================================
+# 🔐 AUTHENTICATION
+# ======================================================
+# One login per browser session, shared by every page of app.py. Each
+# page still calls require_login() so it is protected when run on its own;
+# once the session is authenticated the call is a no-op. The commission
+# calculator additionally asks for the internal password, also once; when
+# it is deployed on its own without an app_password, that is its only gate.
+
+import streamlit as st
+
+WELCOME = """
+    ## 🔐 Elypse Systems and Solutions
+    Welcome to the **Sales Performance Tools**.
+
+    Upload your monthly sales CSV once and get:
+    - A clean, styled summary of key performance metrics
+    - Automated commission scorecards based on our internal point system
+    - Trend insights and GP breakdowns for all employees
+
+    **Please enter the same password we use for Google Drive.**
+    This is to ensure that **company performance data is protected** and only visible to internal team members.
+"""
+
+
+def secret(name):
+    # None when the secret, or the whole secrets file, is missing
+    try:
+        return st.secrets.get(name)
+    except FileNotFoundError:
+        return None
+
+
+def require_secret(name):
+    value = secret(name)
+    if value is None:
+        st.error(f"❌ The `{name}` secret is not configured for this app.")
+        st.stop()
+    return value
+
+
+def require_login(optional=False):
+    # optional: skip the team login when no app_password is configured
+    if st.session_state.get("authenticated"):
+        return
+    if optional and secret("app_password") is None:
+        return
+
+    app_password = require_secret("app_password")
+    st.markdown(WELCOME)
+    password = st.text_input("🔑 Enter password to access this app:", type="password")
+    if st.button("🔓 Submit"):
+        if password == app_password:
+            st.session_state["authenticated"] = True
+            st.rerun()
+        st.error("❌ Incorrect password")
+    st.stop()
+
+
+def require_internal():
+    # Second gate for internal-only pages
+    if st.session_state.get("internal_authenticated"):
+        return
+
+    internal_password = require_secret("internal_password")
+    password = st.text_input("🔐 Enter the internal password to access this page:", type="password")
+    if password == internal_password:
+        st.session_state["internal_authenticated"] = True
+        st.rerun()
+    elif password:
+        st.error("❌ Incorrect password")
+    st.stop()
@@ -0,0 +1,134 @@
+# ======================================================
+# 🗂️ HEADLESS BATCH REPORTS
+# ======================================================
+# Runs the confcall / tuesdaycall pipelines over a folder of Power BI CSV
+# exports without Streamlit, one export per worker process.
+#
+#   python batch.py exports/ -o reports/ --format xlsx --as-of 2025-06-30
+#   python batch.py year/ --chunksize 200000    # stream exports bigger than memory
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import excel_export
+import ingest
+import pipelines
+import projection
+import streaming
+
+REPORTS = ['confcall', 'tuesdaycall']
+
+
+def write_table(df, path, fmt, workbook=None):
+    # workbook: an excel_export builder for tables that have number formats
+    if fmt == 'xlsx' and workbook is not None:
+        path.with_suffix('.xlsx').write_bytes(workbook(df))
+    elif fmt == 'xlsx':
+        df.to_excel(path.with_suffix('.xlsx'), index=False)
+    else:
+        df.round(2).to_csv(path.with_suffix('.csv'), index=False)
+
+
+def group_in_memory(data, reports):
+    df = ingest.parse_export(data, reports)
+    grouped = {}
+    if 'confcall' in reports:
+        grouped['confcall'] = pipelines.group_confcall(pipelines.normalize_employees(pipelines.clean_confcall(df)))
+    if 'tuesdaycall' in reports:
+        grouped['tuesdaycall'] = pipelines.group_tuesday(pipelines.normalize_employees(pipelines.clean_tuesday(df)))
+    return grouped
+
+
+def process_export(csv_path, out_dir, reports, fmt, as_of, method='calendar', chunksize=None):
+    csv_path = Path(csv_path)
+    written = []
+
+    # Sniff the header line, then read only the columns the runnable reports need
+    matches, missing = ingest.sniff(csv_path)
+    if reports is None:
+        # auto: whichever reports this export supports
+        reports = [report for report in REPORTS if report in matches]
+        if not reports:
+            closest = min(REPORTS, key=lambda report: len(missing[report]))
+            raise ValueError(f"not a report export (closest: {closest}, missing: {', '.join(missing[closest])})")
+    runnable = [report for report in reports if report in matches]
+    skipped = [f"{report} (missing: {', '.join(missing[report])})" for report in reports if report not in matches]
+    if not runnable:
+        return csv_path.name, written, skipped
+
+    # Streaming keeps memory bounded on exports too big to load at once
+    if chunksize:
+        grouped = streaming.aggregate_reports(csv_path, runnable, chunksize)
+    else:
+        grouped = group_in_memory(csv_path.read_bytes(), runnable)
+
+    if 'confcall' in runnable:
+        summary, scorecard = pipelines.confcall_reports(pipelines.add_confcall_metrics(grouped['confcall']))
+        for name, table, workbook in [('summary', summary, excel_export.summary_workbook),
+                                      ('scorecard', scorecard, excel_export.scorecard_workbook)]:
+            path = Path(out_dir) / f"{csv_path.stem}_{name}"
+            write_table(table, path, fmt, workbook)
+            written.append(path.name)
+
+    if 'tuesdaycall' in runnable:
+        _, df_final = pipelines.tuesday_reports(grouped['tuesdaycall'], as_of, method)
+        path = Path(out_dir) / f"{csv_path.stem}_performance"
+        if fmt == 'xlsx':
+            write_table(df_final, path, fmt, excel_export.tuesday_workbook)
+        else:
+            write_table(pipelines.tuesday_display(df_final), path, fmt)
+        written.append(path.name)
+
+    return csv_path.name, written, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate scorecards for every Power BI export in a folder.")
+    parser.add_argument('input_dir', help="folder containing Power BI CSV exports")
+    parser.add_argument('-o', '--output-dir', default='reports', help="where to write the reports (default: reports)")
+    parser.add_argument('--report', choices=REPORTS + ['both', 'auto'], default='auto',
+                        help="auto (default) runs whichever reports each export's header supports")
+    parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+    parser.add_argument('--as-of', type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help="date used for GP projections, YYYY-MM-DD (default: today)")
+    # The curve method needs the snapshot history, which batch runs don't read
+    parser.add_argument('--projection', choices=[m for m in projection.METHODS if m != 'curve'],
+                        default='calendar', help="GP projection method (default: calendar)")
+    parser.add_argument('--chunksize', type=int,
+                        help="stream each export in chunks of this many rows instead of loading it whole")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args(argv)
+
+    exports = sorted(Path(args.input_dir).glob('*.csv'))
+    if not exports:
+        parser.error(f"no CSV files found in {args.input_dir}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    reports = {'auto': None, 'both': REPORTS}.get(args.report, [args.report])
+    as_of = args.as_of or datetime.today()
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(process_export, path, args.output_dir, reports, args.format, as_of, args.projection, args.chunksize): path
+            for path in exports
+        }
+        for future in as_completed(futures):
+            try:
+                name, written, skipped = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"❌ {futures[future].name}: {e}")
+                continue
+            print(f"✅ {name}: {', '.join(written) or 'nothing written'}")
+            for reason in skipped:
+                print(f"   ⚠️ skipped {reason}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+# ======================================================
+# ⏱️ PIPELINE BENCHMARKS
+# ======================================================
+# Times and memory-profiles every stage of the confcall and tuesdaycall
+# pipelines on synthetic exports of increasing size. Save a run with
+# --save and compare a later run against it with --baseline to catch
+# regressions.
+#
+#   python bench.py --rows 1000 100000 1000000 --save bench_baseline.json
+#   python bench.py --baseline bench_baseline.json
+
+import argparse
+import json
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+import display
+import ingest
+import pipelines
+import scoring
+import synth
+
+
+def measure(fn, arg, repeat):
+    # Best-of-N wall time without tracing, then one traced run for peak memory
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def confcall_stages():
+    return [
+        ('load', lambda data: ingest.parse_export(data, 'confcall')),
+        ('clean', pipelines.clean_confcall),
+        ('names', pipelines.normalize_employees),
+        ('groupby', pipelines.group_confcall),
+        ('derived', lambda df: pipelines.add_confcall_metrics(df.copy())),
+        ('scoring', scoring.score_frame),
+        ('formatting', lambda df: (pipelines.confcall_summary(df), df)),
+        ('styling', lambda frames: frames[1][pipelines.SCORECARD_COLUMNS].style.format(
+            display.styler_formats(display.SCORECARD)
+        ).to_html()),
+    ]
+
+
+def tuesday_stages(as_of):
+    return [
+        ('load', lambda data: ingest.parse_export(data, 'tuesdaycall')),
+        ('clean', pipelines.clean_tuesday),
+        ('names', pipelines.normalize_employees),
+        ('groupby', pipelines.group_tuesday),
+        ('derived', lambda df: pipelines.tuesday_table(pipelines.add_tuesday_metrics(df.copy(), as_of))[1]),
+        ('formatting', pipelines.tuesday_display),
+        ('styling', lambda df: pipelines.style_tuesday(df).format(display.styler_formats(display.TUESDAY)).to_html()),
+    ]
+
+
+def run_pipeline(name, stages, data, repeat):
+    results = []
+    value = data
+    for stage, fn in stages:
+        value, seconds, peak = measure(fn, value, repeat)
+        rows = len(value) if isinstance(value, pd.DataFrame) else None
+        results.append({'pipeline': name, 'stage': stage, 'seconds': seconds,
+                        'peak_mb': peak / 2**20, 'rows_out': rows})
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    previous = {(r['rows'], r['pipeline'], r['stage']): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        before = previous.get((r['rows'], r['pipeline'], r['stage']))
+        if before is None or before['seconds'] == 0:
+            continue
+        ratio = r['seconds'] / before['seconds']
+        r['vs_baseline'] = round(ratio, 2)
+        if ratio > 1 + tolerance:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on synthetic exports.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--employees', type=int, default=40)
+    parser.add_argument('--pipeline', choices=['confcall', 'tuesdaycall', 'both'], default='both')
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument('--as-of', default='2025-06-15', help="projection date for tuesdaycall")
+    parser.add_argument('--save', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against a JSON file written by --save")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="slowdown vs baseline reported as a regression (default 25%%)")
+    args = parser.parse_args(argv)
+
+    as_of = datetime.strptime(args.as_of, '%Y-%m-%d')
+    results = []
+    for rows in args.rows:
+        data = synth.export_bytes(synth.generate_export(rows, args.employees, seed=rows))
+        runs = []
+        if args.pipeline in ('confcall', 'both'):
+            runs += run_pipeline('confcall', confcall_stages(), data, args.repeat)
+        if args.pipeline in ('tuesdaycall', 'both'):
+            runs += run_pipeline('tuesdaycall', tuesday_stages(as_of), data, args.repeat)
+        for r in runs:
+            r['rows'] = rows
+        results += runs
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    table = pd.DataFrame(results)
+    table['rows_out'] = table['rows_out'].astype('Int64')
+    table = table[['rows', 'pipeline', 'stage', 'seconds', 'peak_mb', 'rows_out']
+                  + (['vs_baseline'] if 'vs_baseline' in table.columns else [])]
+    print(table.to_string(index=False, float_format=lambda x: f"{x:,.4f}"))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'revision': git_revision(), 'created': datetime.now().isoformat(timespec='seconds'),
+                       'results': results}, f, indent=2)
+
+    for r in regressions:
+        print(f"⚠️ {r['pipeline']}/{r['stage']} at {r['rows']:,} rows is {r['vs_baseline']}× the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
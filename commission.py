@@ -0,0 +1,127 @@
+# ======================================================
+# 💵 COMMISSION STATEMENTS
+# ======================================================
+# (GP − 18% royalty) × 18% + $800 bonus − deductions, for one employee or
+# for every employee in an export at once. The math runs in int64 cents
+# (money.py), each step rounded to the cent like payroll does, and works
+# the same on scalars and on whole columns.
+
+import datetime
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+import identity
+import ingest
+import money
+
+# Basis points and cents
+ROYALTY_BPS = 1800
+COMMISSION_BPS = 1800
+BONUS_CENTS = 80_000
+
+STATEMENT_COLUMNS = [
+    'Employee', 'GP', 'Royalty', 'GP After Royalty', 'Commission Subtotal',
+    'Bonus', 'Deductions', 'Commission Earned', 'Deduction Reason'
+]
+
+
+def second_friday(day):
+    first_day = day.replace(day=1)
+    days_until_friday = (4 - first_day.weekday() + 7) % 7
+    return first_day + datetime.timedelta(days=days_until_friday + 7)
+
+
+def breakdown(gp, deductions=0):
+    # gp, deductions: cents; every part comes back in cents
+    royalty = money.apply_rate(gp, ROYALTY_BPS)
+    after_royalty = gp - royalty
+    subtotal = money.apply_rate(after_royalty, COMMISSION_BPS)
+    return {
+        'Royalty': royalty,
+        'GP After Royalty': after_royalty,
+        'Commission Subtotal': subtotal,
+        'Bonus': BONUS_CENTS,
+        'Commission Earned': subtotal + BONUS_CENTS - deductions,
+    }
+
+
+def employee_gp(df):
+    # Total GP per person; every spelling of a name lands on one ID
+    ids, employees = identity.resolve(df['Employee Full Name'])
+    keep = ids >= 0
+    # Cents as float64 weights are whole numbers, so the sums stay exact
+    cents = np.bincount(ids[keep], weights=money.to_cents(df['GP'])[keep], minlength=len(employees))
+    return pd.DataFrame({'Employee': employees.astype(str), 'GP': money.to_dollars(cents)})
+
+
+def read_deductions(data):
+    # Employee, Deductions[, Reason] — amounts may be "$1,234.56" strings
+    df = pd.read_csv(io.BytesIO(data))
+    df.columns = [col.strip() for col in df.columns]
+    missing = ingest.missing_columns(df.columns, ['Employee', 'Deductions'])
+    if missing:
+        raise ingest.MissingColumnsError(missing)
+
+    if 'Reason' not in df.columns:
+        df['Reason'] = ''
+    df['Employee'] = [identity.canonical(name) for name in df['Employee'].astype(str)]
+    df['Deductions'] = money.parse_cents(df['Deductions'])
+    df['Reason'] = df['Reason'].fillna('').astype(str).str.strip()
+
+    df = df.groupby('Employee', as_index=False).agg(
+        Deductions=('Deductions', 'sum'),
+        Reason=('Reason', lambda reasons: '; '.join(r for r in reasons if r)),
+    )
+    df['Deductions'] = money.to_dollars(df['Deductions'])
+    return df
+
+
+def statements(gp, deductions=None):
+    # Returns (statements, deduction rows that matched no employee)
+    if deductions is None:
+        deductions = pd.DataFrame(columns=['Employee', 'Deductions', 'Reason'])
+    df = gp.merge(deductions, on='Employee', how='left')
+    df['Deductions'] = df['Deductions'].fillna(0).astype('float64')
+    df['Deduction Reason'] = df['Reason'].fillna('')
+
+    parts = breakdown(money.to_cents(df['GP']), money.to_cents(df['Deductions']))
+    for col, cents in parts.items():
+        df[col] = money.to_dollars(cents)
+
+    unmatched = deductions[~deductions['Employee'].isin(gp['Employee'])]
+    return df[STATEMENT_COLUMNS], unmatched
+
+
+def statement_text(gp, deductions, reason, due):
+    # gp, deductions: cents
+    cents = breakdown(gp, deductions)
+    parts = {col: money.format_cents(value) for col, value in cents.items()}
+    subtotal_with_bonus = money.format_cents(cents['Commission Subtotal'] + BONUS_CENTS)
+    return f"""Commission Earned: {parts['Commission Earned']}
+
+Calculation Breakdown:
+1. GP Earned = {money.format_cents(gp)}
+2. 18% Royalty Fee (deducted from GP) = {parts['Royalty']}
+3. GP after royalty deduction = {parts['GP After Royalty']}
+4. Commission Subtotal = 18% of result above = {parts['Commission Subtotal']}
+5. Add $800 bonus = {subtotal_with_bonus}
+6. Subtract deductions ({money.format_cents(deductions)})
+7. Final Commission Earned = {parts['Commission Earned']}
+Note: Deduction reason - {reason}
+
+📅 Due on second Friday of this month: {due.strftime('%B %d, %Y')}"""
+
+
+def statement_bundle(df, due):
+    # One text statement per employee plus the whole table as CSV
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr('commission_statements.csv', df.to_csv(index=False))
+        rows = zip(df['Employee'], money.to_cents(df['GP']), money.to_cents(df['Deductions']), df['Deduction Reason'])
+        for employee, gp, deductions, reason in rows:
+            text = statement_text(gp, deductions, reason, due)
+            bundle.writestr(f"statements/{employee.replace(' ', '_')}.txt", text)
+    return buffer.getvalue()
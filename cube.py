@@ -0,0 +1,109 @@
+# ======================================================
+# 🧊 STORE × EMPLOYEE ROLLUP CUBE
+# ======================================================
+# District exports carry rows for many stores, and reps who float between
+# stores show up under several of them. When the export has a Location
+# column the cleaned rows are aggregated once into cells keyed by
+# (District, Location, Employee), each holding per-metric sums plus a row
+# count (the same mergeable partials streaming.py keeps). Every view is
+# re-summed from those cells: districts, stores, the employees of one
+# store, or each employee across all stores. Mean columns come out as
+# sum / count, exactly what groupby().mean() over the raw rows gives, and
+# switching levels in the UI never goes back to the rows.
+#
+# A floating rep is one row in the all-stores employee view (so the
+# commission scorecard sees them once) and one row per store they worked in.
+#
+#   store_cube = cube.build(df_clean, 'tuesdaycall')
+#   df_grouped = cube.rollup(store_cube, 'Employee')
+#   df_stores = cube.rollup(store_cube, 'Location', {'District': 'North'})
+
+import pandas as pd
+import streamlit as st
+
+import display
+import ingest
+import pipelines
+import streaming
+
+KEYS = ['District', 'Location', 'Employee']
+UNASSIGNED = "Unassigned"
+ALL = "All"
+
+# Row level → heading of the first column
+LEVELS = {'District': "District", 'Location': "Store", 'Employee': "Employee"}
+
+LEVEL_LABELS = {'District': "🗺️ Districts", 'Location': "🏬 Stores", 'Employee': "🧑‍💼 Employees"}
+
+COLUMN_SPECS = {'confcall': display.CONFCALL_SUMMARY, 'tuesdaycall': display.TUESDAY}
+
+
+def has_locations(source):
+    return 'Location' in ingest.read_header(source)
+
+
+def build(df, report):
+    # df: cleaned rows (after normalize_employees) with a Location column
+    agg = streaming.AGGREGATIONS[report]
+    df = df.fillna(dict.fromkeys(agg, 0))
+    for key in ['District', 'Location']:
+        labels = df[key].astype(object) if key in df.columns else pd.Series(None, index=df.index, dtype=object)
+        df[key] = labels.where(labels.notna() & (labels != ''), UNASSIGNED)
+
+    sums, counts, dtypes = streaming.accumulate(None, df, agg, KEYS)
+    return {'report': report, 'sums': sums, 'counts': counts, 'dtypes': dtypes}
+
+
+def select(store_cube, where=None):
+    sums, counts = store_cube['sums'], store_cube['counts']
+    for key, value in (where or {}).items():
+        keep = sums.index.get_level_values(key) == value
+        sums, counts = sums[keep], counts[keep]
+    return sums, counts
+
+
+def members(store_cube, key, where=None):
+    # Distinct labels of one key, optionally within a district / store
+    index = select(store_cube, where)[0].index
+    return sorted(index.get_level_values(key).unique())
+
+
+def rollup(store_cube, level, where=None):
+    # One row per label of `level`, with the report's sum / mean semantics
+    sums, counts = select(store_cube, where)
+    partial = sums.groupby(level=level).sum(), counts.groupby(level=level).sum(), store_cube['dtypes']
+    return streaming.finish(partial, streaming.AGGREGATIONS[store_cube['report']], [level])
+
+
+def report_table(store_cube, level, where=None, as_of=None, method='calendar', curve=None):
+    # The page's numeric table (TOTAL row included) with `level` in place of Employee
+    df = rollup(store_cube, level, where).rename(columns={level: 'Employee'})
+    if store_cube['report'] == 'confcall':
+        table = pipelines.confcall_summary(pipelines.add_confcall_metrics(df))
+    else:
+        table = pipelines.tuesday_display(pipelines.tuesday_reports(df, as_of, method, curve)[1])
+    return table.rename(columns={'Employee': LEVELS[level]})
+
+
+def render_drilldown(store_cube, **report_args):
+    # Level and district/store pickers; every table is served from the cube
+    st.subheader("🏬 Store & District Rollups")
+    districts = members(store_cube, 'District')
+    levels = [level for level in LEVELS if level != 'District' or len(districts) > 1]
+
+    col_level, col_district, col_store = st.columns(3)
+    level = col_level.radio("Rows", levels, index=len(levels) - 2, format_func=LEVEL_LABELS.get,
+                            horizontal=True)
+    where = {}
+    if len(districts) > 1 and level != 'District':
+        district = col_district.selectbox("🗺️ District", [ALL, *districts])
+        if district != ALL:
+            where['District'] = district
+    if level == 'Employee':
+        store = col_store.selectbox("🏬 Store", [ALL, *members(store_cube, 'Location', where)])
+        if store != ALL:
+            where['Location'] = store
+
+    table = report_table(store_cube, level, where, **report_args)
+    st.dataframe(table, use_container_width=True, hide_index=True,
+                 column_config=display.column_config(COLUMN_SPECS[store_cube['report']]))
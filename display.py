@@ -0,0 +1,66 @@
+# ======================================================
+# 🎨 DISPLAY FORMATS
+# ======================================================
+# Report tables stay numeric all the way to the screen. Each column's look
+# is declared once here as a kind (money, percent, count, ...) and rendered
+# at display time by st.column_config, Styler.format or an Excel number
+# format, so sorting stays numeric and nothing is parsed back from strings.
+# The tables are plain data shared with the headless Excel export, so
+# streamlit is only imported by the functions that render.
+
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+FORMATS = {
+    'money': {'column': 'dollar', 'styler': '${:,.2f}', 'excel': '"$"#,##0.00'},
+    'percent': {'column': '%.0f%%', 'styler': '{:.0f}%', 'excel': '0"%"'},
+    'percent2': {'column': '%.2f%%', 'styler': '{:.2f}%', 'excel': '0.00"%"'},
+    'decimal': {'column': '%.2f', 'styler': '{:.2f}', 'excel': '0.00'},
+    'count': {'column': '%d', 'styler': '{:,.0f}', 'excel': '0'},
+}
+
+CONFCALL_SUMMARY = {
+    'News': 'count', 'Upgrades': 'count', 'SMT GA': 'count', 'SMB GA': 'count',
+    'VZ Perks Rate (%)': 'percent2', 'Premium Unlim (%)': 'percent2', 'VMP': 'percent2',
+    'GP': 'money', 'SMT QTY': 'count', 'FIOS/VHI': 'count', 'Total GA': 'count',
+    'Ratio': 'decimal', 'GP Per Smart': 'money',
+}
+
+SCORECARD = {
+    'Score SMT': 'count', 'Score Upgrades': 'count', 'Score Perks': 'count', 'Score VMP': 'count',
+    'Score SMB': 'count', 'Score Unlimited': 'count', 'Score VHI/FIOS': 'count', 'Score GP': 'count',
+    'Points': 'decimal', 'Commission %': 'percent', 'Commission Earned': 'money',
+}
+
+TUESDAY = {
+    'News': 'count', 'Upgrades': 'count', 'Ratio': 'percent', 'SMT GA': 'count',
+    'Perks': 'decimal', 'VMP': 'decimal', 'Premium Unlimited': 'percent', 'GP': 'money',
+    'GP Per Smart': 'money', 'SMB GA': 'count', 'VZPH': 'count', 'Verizon Visa': 'count',
+    'VHI/FIOS': 'count', 'Projected GP': 'money',
+}
+
+LEADERBOARD = {'GP': 'money', 'GP Per Smart': 'money', 'Points': 'decimal'}
+
+
+def column_config(spec):
+    import streamlit as st
+    return {col: st.column_config.NumberColumn(format=FORMATS[kind]['column']) for col, kind in spec.items()}
+
+
+def styler_formats(spec):
+    return {col: FORMATS[kind]['styler'] for col, kind in spec.items()}
+
+
+def excel_formats(spec):
+    return {col: FORMATS[kind]['excel'] for col, kind in spec.items()}
+
+
+def excel_download(label, file_name, workbook, df):
+    # workbook: name of an excel_export builder. The file is built when the
+    # button is clicked, not on every rerun, and openpyxl only loads then.
+    import streamlit as st
+
+    def build():
+        import excel_export
+        return getattr(excel_export, workbook)(df)
+
+    st.download_button(label=label, data=build, file_name=file_name, mime=XLSX_MIME)
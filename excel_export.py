@@ -0,0 +1,120 @@
+# ======================================================
+# 📗 EXCEL REPORTS
+# ======================================================
+# Writes report tables as real numbers with Excel number formats, through
+# openpyxl's write-only worksheets so rows are streamed to the file instead
+# of held in memory. Goal colours are native conditional-formatting rules
+# built from pipelines.THRESHOLDS, so they survive edits in Excel. With
+# lxml installed openpyxl serialises rows noticeably faster.
+
+import io
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+import display
+import pipelines
+
+TUESDAY_FORMATS = display.excel_formats(display.TUESDAY)
+SCORECARD_FORMATS = display.excel_formats(display.SCORECARD)
+SUMMARY_FORMATS = display.excel_formats(display.CONFCALL_SUMMARY)
+
+# Same colours as the on-screen table
+GOOD_FILL = PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid')
+BAD_FILL = PatternFill(start_color='F08080', end_color='F08080', fill_type='solid')
+
+
+def goal_rules(ws, df, thresholds):
+    last_row = len(df) + 1
+    for col, threshold in thresholds.items():
+        if col not in df.columns:
+            continue
+        letter = get_column_letter(df.columns.get_loc(col) + 1)
+        # Round like pipelines.goal_mask so Excel and the app agree at the edges
+        digits = 0 if col in ['Ratio', 'Premium Unlimited'] else 2
+        value = f"ROUND({letter}2,{digits})"
+        good = f">={threshold['value']}" if threshold['higher_is_better'] else f"<={threshold['value']}"
+        bad = f"<{threshold['value']}" if threshold['higher_is_better'] else f">{threshold['value']}"
+        cells = f"{letter}2:{letter}{last_row}"
+        ws.conditional_formatting.add(cells, FormulaRule(formula=[value + good], fill=GOOD_FILL))
+        ws.conditional_formatting.add(cells, FormulaRule(formula=[value + bad], fill=BAD_FILL))
+
+
+def write_sheet(wb, title, df, number_formats, thresholds=None):
+    ws = wb.create_sheet(title)
+    ws.freeze_panes = 'A2'
+    for idx, col in enumerate(df.columns, 1):
+        ws.column_dimensions[get_column_letter(idx)].width = max(10, len(str(col)) + 2)
+
+    header = []
+    for col in df.columns:
+        cell = WriteOnlyCell(ws, value=col)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+
+    # One styled cell per column, reused for every row: write-only sheets
+    # serialise a row as soon as it is appended
+    templates = []
+    for col in df.columns:
+        fmt = number_formats.get(col)
+        if fmt is None and col != 'Employee':
+            kind = 'count' if df[col].dtype.kind in 'iu' or (df[col] % 1 == 0).all() else 'decimal'
+            fmt = display.FORMATS[kind]['excel']
+        if fmt is None:
+            templates.append(None)
+        else:
+            cell = WriteOnlyCell(ws)
+            cell.number_format = fmt
+            templates.append(cell)
+
+    # Rates parsed as float32 would otherwise land in Excel as 41.15000152587891;
+    # the export carries two decimals, so four keeps everything that matters.
+    # Rows are converted one at a time, so no full copy of the table is made.
+    floats = [df[col].dtype.kind == 'f' for col in df.columns]
+    for row in df.itertuples(index=False, name=None):
+        out = []
+        for template, is_float, value in zip(templates, floats, row):
+            if is_float:
+                value = None if value != value else round(value, 4)
+            elif not isinstance(value, str) and pd.isna(value):
+                value = None
+            if template is None or value is None:
+                out.append(value)
+            else:
+                template.value = value
+                out.append(template)
+        ws.append(out)
+
+    if thresholds:
+        goal_rules(ws, df, thresholds)
+    return ws
+
+
+def workbook_bytes(sheets):
+    # sheets: (title, df, number_formats, thresholds) tuples
+    wb = Workbook(write_only=True)
+    for title, df, number_formats, thresholds in sheets:
+        write_sheet(wb, title, df, number_formats, thresholds)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def tuesday_workbook(df_values):
+    # df_values: numeric performance table including the TOTAL row
+    df = pipelines.tuesday_display(df_values)
+    return workbook_bytes([('Performance', df, TUESDAY_FORMATS, pipelines.THRESHOLDS)])
+
+
+def scorecard_workbook(df_points):
+    df = df_points[pipelines.SCORECARD_COLUMNS].reset_index(drop=True)
+    return workbook_bytes([('Scorecard', df, SCORECARD_FORMATS, None)])
+
+
+def summary_workbook(df_summary):
+    return workbook_bytes([('Summary', df_summary, SUMMARY_FORMATS, None)])
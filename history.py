@@ -0,0 +1,182 @@
+# ======================================================
+# 🗃️ MONTHLY SNAPSHOT HISTORY
+# ======================================================
+# A local SQLite store of the per-employee aggregates each page produces.
+# A snapshot is keyed by page + upload hash (saving the same export twice
+# is a no-op) and tagged with its period (YYYY-MM) and as-of date. A newer
+# export for the same page and as-of date replaces the older one. Metrics
+# are stored long (employee, metric, value) and indexed by employee and by
+# period, so month-over-month and year-to-date views are plain SQL over
+# already-aggregated rows instead of re-parsing old CSVs.
+
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+DB_PATH = os.environ.get(
+    "WZM_HISTORY_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.sqlite3")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    page TEXT NOT NULL,
+    upload_hash TEXT NOT NULL,
+    period TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (page, upload_hash)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS snapshots_page_as_of ON snapshots (page, as_of);
+
+CREATE TABLE IF NOT EXISTS employee_metrics (
+    page TEXT NOT NULL,
+    upload_hash TEXT NOT NULL,
+    period TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    employee TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (page, upload_hash, employee, metric)
+);
+CREATE INDEX IF NOT EXISTS employee_metrics_employee ON employee_metrics (page, employee, metric);
+CREATE INDEX IF NOT EXISTS employee_metrics_period ON employee_metrics (page, period, metric);
+"""
+
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def save_snapshot(frame, page, upload_hash, as_of, path=DB_PATH):
+    # Returns False when this exact upload is already stored
+    as_of = pd.Timestamp(as_of).date()
+    period = as_of.strftime("%Y-%m")
+
+    rows = frame.assign(Employee=frame["Employee"].astype(str)).melt(
+        id_vars="Employee", var_name="metric", value_name="value"
+    )
+    rows = rows[pd.to_numeric(rows["value"], errors="coerce").notna()]
+
+    with closing(connect(path)) as conn, conn:
+        exists = conn.execute(
+            "SELECT 1 FROM snapshots WHERE page = ? AND upload_hash = ?", (page, upload_hash)
+        ).fetchone()
+        if exists:
+            return False
+
+        # A re-export for the same day supersedes the earlier one
+        conn.execute(
+            "DELETE FROM employee_metrics WHERE page = ? AND as_of = ?", (page, as_of.isoformat())
+        )
+        conn.execute("DELETE FROM snapshots WHERE page = ? AND as_of = ?", (page, as_of.isoformat()))
+
+        conn.execute(
+            "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?)",
+            (page, upload_hash, period, as_of.isoformat(), datetime.now().isoformat(timespec="seconds")),
+        )
+        conn.executemany(
+            "INSERT INTO employee_metrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (page, upload_hash, period, as_of.isoformat(), employee, metric, float(value))
+                for employee, metric, value in rows.itertuples(index=False)
+            ],
+        )
+    return True
+
+
+# Latest snapshot of each period, i.e. the most complete month-to-date
+# numbers. Params (page, page); callers append one "AND ..." filter.
+LATEST_PER_PERIOD = """
+SELECT m.period, m.employee, m.metric, m.value
+FROM employee_metrics m
+JOIN (
+    SELECT page, period, MAX(as_of) AS as_of FROM snapshots WHERE page = ? GROUP BY page, period
+) latest ON latest.page = m.page AND latest.period = m.period AND latest.as_of = m.as_of
+WHERE m.page = ?
+"""
+
+
+def month_over_month(page, metric, path=DB_PATH):
+    with closing(connect(path)) as conn:
+        rows = pd.read_sql_query(LATEST_PER_PERIOD + "AND m.metric = ?", conn, params=(page, page, metric))
+    if rows.empty:
+        return pd.DataFrame(columns=["Employee"])
+    table = rows.pivot(index="employee", columns="period", values="value").sort_index(axis=1)
+    table.index.name = "Employee"
+    table.columns.name = None
+    return table.reset_index()
+
+
+def year_to_date(page, year, mean_metrics=(), path=DB_PATH):
+    # Sums across months, except rate metrics which are averaged
+    with closing(connect(path)) as conn:
+        rows = pd.read_sql_query(
+            LATEST_PER_PERIOD + "AND m.period LIKE ?", conn, params=(page, page, f"{year}-%"),
+        )
+    if rows.empty:
+        return pd.DataFrame(columns=["Employee"])
+    is_mean = rows["metric"].isin(list(mean_metrics))
+    sums = rows[~is_mean].pivot_table(index="employee", columns="metric", values="value", aggfunc="sum")
+    means = rows[is_mean].pivot_table(index="employee", columns="metric", values="value", aggfunc="mean")
+    table = pd.concat([sums, means], axis=1)
+    table.index.name = "Employee"
+    table.columns.name = None
+    return table.reset_index()
+
+
+def metric_totals(page, metric, path=DB_PATH):
+    # Team total of one metric at every saved as-of date
+    with closing(connect(path)) as conn:
+        return pd.read_sql_query(
+            "SELECT period, as_of, SUM(value) AS value FROM employee_metrics"
+            " WHERE page = ? AND metric = ? GROUP BY period, as_of ORDER BY as_of",
+            conn, params=(page, metric),
+        )
+
+
+def periods(page, path=DB_PATH):
+    with closing(connect(path)) as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT DISTINCT period FROM snapshots WHERE page = ? ORDER BY period", (page,)
+        )]
+
+
+# ======================================================
+# 🖥️ PAGE PANEL
+# ======================================================
+
+def render_panel(page, frame, upload_hash, default_as_of, mean_metrics=(), path=DB_PATH, on_save=None):
+    # on_save(page, path) runs after a new snapshot is stored (see leaderboard.update)
+    st.subheader("🗃️ Monthly History")
+    as_of = st.date_input("Snapshot as-of date", value=default_as_of, key=f"{page}_history_as_of")
+    if st.button("💾 Save this month's snapshot", key=f"{page}_history_save"):
+        if save_snapshot(frame, page, upload_hash, as_of, path):
+            if on_save is not None:
+                on_save(page, path)
+            st.success(f"✅ Saved snapshot for {as_of:%B %Y} (as of {as_of:%b %d}).")
+        else:
+            st.info("ℹ️ This export is already in the history.")
+
+    if not periods(page, path):
+        st.caption("No snapshots saved yet.")
+        return
+
+    with st.expander("📅 Month over month"):
+        metrics = [col for col in frame.columns if col != "Employee"]
+        metric = st.selectbox("Metric", metrics, index=metrics.index("GP") if "GP" in metrics else 0,
+                              key=f"{page}_history_metric")
+        table = month_over_month(page, metric, path)
+        if len(table.columns) > 2:
+            last, previous = table.columns[-1], table.columns[-2]
+            table["Change"] = table[last] - table[previous]
+        st.dataframe(table, use_container_width=True, hide_index=True)
+
+        st.markdown(f"**Year to date ({as_of.year})**")
+        st.dataframe(year_to_date(page, as_of.year, mean_metrics, path),
+                     use_container_width=True, hide_index=True)
@@ -0,0 +1,154 @@
+# ======================================================
+# 🪪 EMPLOYEE IDENTITY RESOLUTION
+# ======================================================
+# Power BI spells the same rep several ways ("Maria Lopez", "lopez maria",
+# "Josh Ordonez" vs "Josue Ordonez"). resolve() factorizes the name column,
+# canonicalizes each distinct spelling once, folds known aliases together
+# and hands back one integer ID per row. IDs are assigned in alphabetical
+# order of the canonical name, so grouping by ID sorts like grouping by name.
+#
+# The alias table lives in aliases.json and is maintained from the command line:
+#
+#   python identity.py list
+#   python identity.py add "Josh Ordonez" "Josue Ordonez"
+#   python identity.py remove "Josh Ordonez"
+
+import argparse
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+ALIASES_PATH = os.environ.get(
+    "WZM_ALIASES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "aliases.json")
+)
+
+PLACEHOLDER_NAMES = ['rep enc', 'unknown']
+
+
+@lru_cache(maxsize=4096)
+def canonical_name(name):
+    # "lopez  maria " → "Lopez Maria": token order and case no longer matter
+    return " ".join(sorted(name.lower().split())).title()
+
+
+PLACEHOLDERS = {canonical_name(name) for name in PLACEHOLDER_NAMES}
+
+
+def is_person(name):
+    # Compared canonically, so "Rep Enc" is caught however it is spelled
+    # (add_alias only ever sees the canonical "Enc Rep")
+    return len(name.split()) >= 2 and canonical_name(name) not in PLACEHOLDERS
+
+
+def load_aliases(path=ALIASES_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        aliases = json.load(f)
+    return {canonical_name(alias): canonical_name(target) for alias, target in aliases.items()}
+
+
+def save_aliases(aliases, path=ALIASES_PATH):
+    # Written to a temp file and swapped in, so a reader never sees half a file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".part")
+    with os.fdopen(fd, "w") as f:
+        json.dump(dict(sorted(aliases.items())), f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def add_alias(alias, target, path=ALIASES_PATH):
+    alias, target = canonical_name(alias), canonical_name(target)
+    for name in (alias, target):
+        if not is_person(name):
+            raise ValueError(f"{name!r} is not a first and last name")
+    aliases = load_aliases(path)
+    # Point at the final name, so every lookup stays a single step
+    final = aliases.get(target, target)
+    if alias == final:
+        raise ValueError(f"{alias!r} and {target!r} are already the same person")
+
+    aliases = {a: final if t == alias else t for a, t in aliases.items()}
+    aliases[alias] = final
+    save_aliases(aliases, path)
+    return aliases
+
+
+def remove_alias(alias, path=ALIASES_PATH):
+    aliases = load_aliases(path)
+    if aliases.pop(canonical_name(alias), None) is None:
+        raise KeyError(f"{canonical_name(alias)!r} is not an alias")
+    save_aliases(aliases, path)
+    return aliases
+
+
+def canonical(name, aliases=None):
+    aliases = load_aliases() if aliases is None else aliases
+    name = canonical_name(name)
+    return aliases.get(name, name)
+
+
+def resolve(names, aliases=None):
+    # Returns (row IDs, employee names); rows that aren't a person get ID -1
+    aliases = load_aliases() if aliases is None else aliases
+
+    names = pd.Series(names)
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        # Already factorized at load time
+        codes, spellings = names.cat.codes.to_numpy(), names.cat.categories.astype(str)
+    else:
+        codes, spellings = pd.factorize(names.astype(str), use_na_sentinel=True)
+    canon = np.array([
+        aliases.get(canonical_name(s), canonical_name(s)) if is_person(s) else ""
+        for s in spellings
+    ], dtype=object)
+
+    employees = pd.Index(np.unique(canon[canon != ""]), name="Employee")
+    spelling_ids = np.where(canon != "", employees.get_indexer(canon), -1)
+    # Missing names carry code -1, which lands on the trailing -1
+    ids = np.append(spelling_ids, -1)[codes]
+    return ids, employees
+
+
+def employee_categorical(ids, employees):
+    # Row-level Employee column stored as integer codes into the name index
+    return pd.Categorical.from_codes(ids, categories=employees)
+
+
+def lookup(name, employees, aliases=None):
+    target = canonical(name, aliases)
+    return employees.get_loc(target) if target in employees else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the employee alias table.")
+    parser.add_argument('--aliases', default=ALIASES_PATH, help="alias file (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="show every alias")
+    add = commands.add_parser('add', help="treat ALIAS as another spelling of TARGET")
+    add.add_argument('alias')
+    add.add_argument('target')
+    remove = commands.add_parser('remove', help="forget an alias")
+    remove.add_argument('alias')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'add':
+            aliases = add_alias(args.alias, args.target, args.aliases)
+            print(f"✅ {canonical_name(args.alias)} → {aliases[canonical_name(args.alias)]}")
+        elif args.command == 'remove':
+            remove_alias(args.alias, args.aliases)
+            print(f"🗑️ Removed {canonical_name(args.alias)}")
+        else:
+            for alias, target in load_aliases(args.aliases).items():
+                print(f"{alias} → {target}")
+    except (ValueError, KeyError) as e:
+        parser.error(e.args[0])
+
+
+if __name__ == '__main__':
+    main()
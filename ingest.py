@@ -0,0 +1,203 @@
+# ======================================================
+# 📥 SHARED POWER BI CSV INGESTION
+# ======================================================
+# Every page (confcall, tuesdaycall, calculator) and the headless batch /
+# streaming CLIs parse exports through here. The report pages parse inside
+# a background job (jobs.py) shared by every session that uploads the same
+# bytes; the calculator goes through upload_store.load_data, a process-wide
+# cache keyed by the file's digest. Nothing here imports streamlit.
+#
+# Each page declares the columns it needs in SCHEMAS. The header (first line
+# only) is checked against the schema before the body is parsed, so a wrong
+# export is rejected, or pointed at the page it belongs to, without a full
+# read. Only the schema's columns are read, money/percent strings become
+# floats straight out of the reader and the employee name is categorical.
+
+import csv
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+
+import money
+
+# Columns Power BI exports as "55.3%" strings
+PERCENT_COLUMNS = [
+    'VZ Perks Rate', 'VMP Take Rate', '(RQ) Consumer SMT Prem Unlim %',
+    'VZ Premium %', '(CCRS) SMB Prem Unl %'
+]
+
+# Plain quantity columns (may carry thousands separators)
+COUNT_COLUMNS = [
+    'GA', 'Upgrades', 'SMT GA', 'SMB GA', 'SMT Qty', 'VZ FWA GA',
+    'VZ FIOS GA', 'VZPH Qty', 'VZ CC QTY'
+]
+
+NAME_COLUMN = 'Employee Full Name'
+
+# Optional store columns on district / multi-store exports; read whenever the
+# header has them so the reports can roll up by store (cube.py)
+LOCATION_COLUMNS = ['District', 'Location']
+
+# Columns each page reads from the export
+SCHEMAS = {
+    'confcall': [
+        'Employee Full Name', 'GA', 'Upgrades', 'SMT GA', 'SMB GA',
+        'VZ Perks Rate', '(RQ) Consumer SMT Prem Unlim %', 'VZ FWA GA',
+        'VZ FIOS GA', 'VMP Take Rate', 'GP', 'SMT Qty'
+    ],
+    'tuesdaycall': [
+        'Employee Full Name', 'GA', 'Upgrades', 'SMT GA', 'SMB GA', 'VZ Perks Rate',
+        'VMP Take Rate', 'VZ Premium %', '(CCRS) SMB Prem Unl %', 'GP', 'SMT Qty',
+        'VZ FWA GA', 'VZ FIOS GA', 'VZPH Qty', 'VZ CC QTY'
+    ],
+    'calculator': ['Employee Full Name', 'GP'],
+}
+
+
+class MissingColumnsError(ValueError):
+    def __init__(self, missing):
+        self.missing = missing
+        super().__init__(f"Missing columns: {', '.join(missing)}")
+
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def parse_distinct(series, parse, fill):
+    # parse: Series → array. A categorical is parsed once per distinct string
+    # and expanded through its codes; missing values get fill.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = np.asarray(parse(pd.Series(series.cat.categories)))
+        return np.append(values, fill)[series.cat.codes.to_numpy()]
+    return np.asarray(parse(series))
+
+
+def parse_number(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    cleaned = series.astype(str).str.replace(r'[\$,%]', '', regex=True).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def to_number(series, dtype='float64'):
+    parsed = parse_distinct(series, parse_number, np.nan).astype(dtype)
+    return pd.Series(parsed, index=series.index, name=series.name)
+
+
+def strip_names(names):
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        stripped = names.cat.categories.str.strip()
+        if stripped.is_unique:
+            return names.cat.rename_categories(stripped)
+        return names.astype(str).str.strip().astype('category')
+    if pd.api.types.is_numeric_dtype(names):
+        return names
+    return names.str.strip()
+
+
+def normalize_export(df):
+    df.columns = [col.strip() for col in df.columns]
+
+    for col in [NAME_COLUMN, *LOCATION_COLUMNS]:
+        if col in df.columns:
+            df[col] = strip_names(df[col])
+
+    for col in money.MONEY_COLUMNS:
+        if col in df.columns:
+            # Parsed to exact cents, kept as dollars (always a whole number of cents)
+            df[col] = money.to_dollars(parse_distinct(df[col], money.parse_cents, 0))
+    for col in PERCENT_COLUMNS:
+        if col in df.columns:
+            df[col] = to_number(df[col], 'float32')
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            counts = to_number(df[col], 'float32')
+            # Whole, complete counts are stored as int32; blanks keep them float32
+            if counts.notna().all() and (counts % 1 == 0).all():
+                counts = counts.astype('int32')
+            df[col] = counts
+
+    return df
+
+
+def as_buffer(source):
+    # Raw bytes or anything pandas can read (path, open file)
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def read_header(source):
+    # Raw header names (possibly padded) keyed by their stripped form. Only
+    # the first line is read, so this is cheap enough to run on every upload.
+    if isinstance(source, bytes):
+        end = source.find(b'\n')
+        line = source if end < 0 else source[:end]
+    else:
+        with open(source, 'rb') as f:
+            line = f.readline()
+    names = next(csv.reader([line.decode('utf-8-sig', errors='replace').rstrip('\r\n')]), [])
+    return {name.strip(): name for name in names}
+
+
+def missing_columns(header, columns):
+    return [col for col in columns if col not in header]
+
+
+def identify(header):
+    # Pages whose schema this header satisfies, and what every page is missing
+    missing = {page: missing_columns(header, columns) for page, columns in SCHEMAS.items()}
+    return [page for page, cols in missing.items() if not cols], missing
+
+
+def sniff(source):
+    return identify(read_header(source))
+
+
+def page_columns(page):
+    if isinstance(page, str):
+        return SCHEMAS[page]
+    return list(dict.fromkeys(col for name in page for col in SCHEMAS[name]))
+
+
+def checked_header(source, columns):
+    # Validate against the schema before paying for the full parse
+    header = read_header(source)
+    missing = missing_columns(header, columns)
+    if missing:
+        raise MissingColumnsError(missing)
+    return header
+
+
+def location_columns(header):
+    return [col for col in LOCATION_COLUMNS if col in header]
+
+
+def read_options(header, columns):
+    # Names and percents repeat heavily, so they are read as categoricals and
+    # each distinct value is handled once; money is read as plain strings
+    dtypes = {}
+    for col in columns:
+        if col in (NAME_COLUMN, *LOCATION_COLUMNS) or col in PERCENT_COLUMNS:
+            dtypes[header[col]] = 'category'
+        elif col in money.MONEY_COLUMNS:
+            dtypes[header[col]] = str
+    return {'usecols': [header[col] for col in columns], 'dtype': dtypes, 'thousands': ','}
+
+
+def parse_export(source, page):
+    header = checked_header(source, page_columns(page))
+    columns = page_columns(page) + location_columns(header)
+    df = pd.read_csv(as_buffer(source), **read_options(header, columns))
+    return normalize_export(df)[columns]
+
+
+def iter_export(source, page, chunksize):
+    # Same parse as parse_export, one normalized chunk of rows at a time
+    header = checked_header(source, page_columns(page))
+    columns = page_columns(page) + location_columns(header)
+    with pd.read_csv(as_buffer(source), chunksize=chunksize, **read_options(header, columns)) as reader:
+        for chunk in reader:
+            yield normalize_export(chunk)[columns]
+
@@ -0,0 +1,174 @@
+# ======================================================
+# ⏳ BACKGROUND JOBS
+# ======================================================
+# Runs a page's heavy stages (parse → clean → aggregate) on a worker
+# thread so the page stays responsive on big multi-store exports. As each
+# stage finishes, its row count and a short preview are kept so the page
+# can show partial results while later stages run; only the last stage's
+# output is kept whole. A failure is reported against the stage that
+# raised it. Cancelling takes effect between stages.
+#
+# Jobs are shared by every session and keyed by the upload's digest, so a
+# rerun (or a second manager uploading the same export) picks up the
+# running or finished job instead of starting another one. Only finished
+# jobs are ever evicted, so past MAX_WORKERS a new upload just waits its
+# turn in the worker queue; a page polling its job keeps it fresh.
+#
+#   job = jobs.submit(("tuesdaycall", digest), [("parse", parse), ("clean", clean)], data)
+#   if not job.finished:
+#       jobs.show_progress(job)
+#       st.stop()
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+MAX_WORKERS = int(os.environ.get("WZM_JOB_WORKERS", 2))
+MAX_JOBS = 8
+JOB_TTL_SECONDS = 60 * 60
+POLL_SECONDS = 0.5
+PREVIEW_ROWS = 100
+
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="wzm-job")
+
+_jobs = OrderedDict()
+_lock = threading.Lock()
+
+
+class Job:
+    def __init__(self, key, stages, value):
+        self.key = key
+        self.stages = [name for name, _ in stages]
+        self.rows = {}
+        self.previews = {}
+        self.result = None
+        self.seconds = {}
+        self.current = None
+        self.error = None  # (stage, exception)
+        self.status = "queued"
+        self.used = time.time()
+        self._cancel = threading.Event()
+        self._future = EXECUTOR.submit(self._run, stages, value)
+
+    def _run(self, stages, value):
+        self.status = "running"
+        for name, fn in stages:
+            if self._cancel.is_set():
+                self.status = "cancelled"
+                return
+            self.current = name
+            start = time.perf_counter()
+            try:
+                value = fn(value)
+            except Exception as e:
+                self.error = (name, e)
+                self.status = "failed"
+                return
+            self.seconds[name] = time.perf_counter() - start
+            # Only frames have rows; the cube stage returns a dict of parts
+            self.rows[name] = len(value) if isinstance(value, pd.DataFrame) else None
+            if name == self.stages[-1]:
+                self.result = value
+            elif hasattr(value, "head"):
+                # A copy, so the preview doesn't keep the whole frame alive
+                self.previews[name] = value.head(PREVIEW_ROWS).copy()
+        self.current = None
+        self.status = "cancelled" if self._cancel.is_set() else "done"
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def progress(self):
+        return len(self.seconds) / len(self.stages)
+
+    def cancel(self):
+        self._cancel.set()
+        if self._future.cancel():
+            self.status = "cancelled"
+
+
+def _evict(now):
+    # Keeps the MAX_JOBS most recently used finished jobs. A queued or running
+    # job is never dropped, or its session would resubmit it and evict the next
+    finished = [k for k, job in _jobs.items() if job.finished]
+    for i, key in enumerate(finished):
+        if i < len(finished) - MAX_JOBS or now - _jobs[key].used > JOB_TTL_SECONDS:
+            del _jobs[key]
+
+
+def submit(key, stages, value):
+    # Reuse the job for this key if there is one, otherwise start it
+    with _lock:
+        job = _jobs.get(key)
+        if job is None:
+            job = _jobs[key] = Job(key, stages, value)
+        touch(job)
+        _evict(job.used)
+        return job
+
+
+def touch(job):
+    # Marks a job as recently used; call with _lock held
+    if _jobs.get(job.key) is job:
+        job.used = time.time()
+        _jobs.move_to_end(job.key)
+
+
+def discard(key):
+    with _lock:
+        job = _jobs.pop(key, None)
+    if job is not None:
+        job.cancel()
+
+
+def show_progress(job, partial=None):
+    # Polls the job, rendering partial results; reruns the page once it is finished
+    @st.fragment(run_every=POLL_SECONDS)
+    def poll():
+        if job.finished:
+            st.rerun(scope="app")
+        with _lock:
+            touch(job)
+
+        done = len(job.seconds)
+        if job.status == "queued":
+            st.progress(0.0, text="⏳ Waiting for other exports to finish…")
+        else:
+            stage = job.current or job.stages[min(done, len(job.stages) - 1)]
+            st.progress(job.progress, text=f"⏳ {stage}… ({done}/{len(job.stages)} stages done)")
+        if st.button("✖️ Cancel", key="cancel_job"):
+            job.cancel()
+            st.rerun(scope="app")
+        if partial is not None:
+            partial(job)
+
+    poll()
+
+
+def show_cleaned(job):
+    # Partial result for show_progress: the cleaned rows while the last stage runs
+    if "clean" in job.previews:
+        st.caption(f"🧹 Cleaned {job.rows['clean']:,} rows; running the {job.current or 'last'} stage…")
+        st.dataframe(job.previews["clean"], use_container_width=True)
+
+
+def show_outcome(job, key):
+    # Reports a failed or cancelled job and offers a restart; returns True if it did
+    if job.status == "done":
+        return False
+    if job.status == "cancelled":
+        st.info("✖️ Processing was cancelled.")
+    else:
+        stage, error = job.error
+        st.error(f"❌ The {stage} stage failed: {error}")
+    if st.button("🔁 Start over", key="restart_job"):
+        discard(key)
+        st.rerun()
+    return True
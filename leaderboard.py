@@ -0,0 +1,354 @@
+# ======================================================
+# 🏆 ROLLING LEADERBOARDS
+# ======================================================
+# Trailing 7/30/90-day GP, GP Per Smart and Points per employee, with each
+# rep's rank and how it moved since the previous snapshot. Built on the
+# snapshot history (history.py), in the same SQLite file.
+#
+# Exports are month-to-date, so every saved snapshot is first turned into a
+# daily increment: GP and smarts booked since the previous snapshot of the
+# same month (the whole month-to-date value on a month's first snapshot).
+# Points is a month-to-date score rather than a sum, so the windows average
+# the daily Points instead.
+#
+# The windows are running sums, moved forward one snapshot at a time: the
+# new day is added and the days that fell out of each window are taken
+# off, so an update touches only those days, never the whole history. A
+# snapshot saved for an earlier date than the newest one (a backfill)
+# replays the page's increments from scratch; a re-export of the newest
+# day is undone and re-applied. GP is summed in integer cents (money.py)
+# so years of adds and removes never drift.
+#
+# The windows are updated once, right after a snapshot is saved (the
+# on_save hook of history.render_panel); drawing the panel only reads,
+# through a read-only connection. Reading a leaderboard scans one row per
+# employee, however long the history, and picks the top k with a partial
+# selection.
+
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date, timedelta
+from urllib.request import pathname2url
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import display
+import history
+import money
+
+WINDOWS = [7, 30, 90]
+METRICS = ['GP', 'GP Per Smart', 'Points']
+
+# The smart quantity is spelled differently by each page
+SMART_COLUMNS = ['SMT Qty', 'SMT QTY']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard_daily (
+    page TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    employee TEXT NOT NULL,
+    gp_cents INTEGER NOT NULL,
+    smart REAL NOT NULL,
+    points REAL,
+    PRIMARY KEY (page, as_of, employee)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_windows (
+    page TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    employee TEXT NOT NULL,
+    gp_cents INTEGER NOT NULL,
+    smart REAL NOT NULL,
+    points_sum REAL NOT NULL,
+    points_days INTEGER NOT NULL,
+    snapshots INTEGER NOT NULL,
+    PRIMARY KEY (page, days, employee)
+);
+
+CREATE TABLE IF NOT EXISTS leaderboard_ranks (
+    page TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    employee TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    previous_rank INTEGER,
+    PRIMARY KEY (page, days, metric, employee)
+);
+
+-- Snapshots already folded into the windows, in as-of order
+CREATE TABLE IF NOT EXISTS leaderboard_applied (
+    page TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    upload_hash TEXT NOT NULL,
+    PRIMARY KEY (page, as_of)
+);
+"""
+
+# Moves one window: adds the days in (start, end], drops those in (start_w, end_w]
+SHIFT = """
+INSERT INTO leaderboard_windows
+SELECT :page, :days, employee, SUM(sign * gp_cents), SUM(sign * smart),
+       SUM(sign * COALESCE(points, 0)), SUM(sign * (points IS NOT NULL)), SUM(sign)
+FROM (
+    SELECT *, :sign * ((as_of > :start AND as_of <= :end) - (as_of > :start_w AND as_of <= :end_w)) AS sign
+    FROM leaderboard_daily
+    WHERE page = :page AND as_of > :start_w AND as_of <= :end
+)
+WHERE sign != 0
+GROUP BY employee
+ON CONFLICT (page, days, employee) DO UPDATE SET
+    gp_cents = gp_cents + excluded.gp_cents,
+    smart = smart + excluded.smart,
+    points_sum = points_sum + excluded.points_sum,
+    points_days = points_days + excluded.points_days,
+    snapshots = snapshots + excluded.snapshots
+"""
+
+
+def connect(path=history.DB_PATH):
+    conn = history.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def reader(path=history.DB_PATH):
+    # Read-only connection, or None before any snapshot has been ranked
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{pathname2url(path)}?mode=ro", uri=True, timeout=30)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'leaderboard_applied'").fetchone() is None:
+        conn.close()
+        return None
+    return conn
+
+
+def days_before(as_of, days):
+    return (date.fromisoformat(as_of) - timedelta(days=days)).isoformat()
+
+
+# ======================================================
+# 🔁 INCREMENTAL UPDATES
+# ======================================================
+
+def snapshot_metrics(conn, page, upload_hash):
+    rows = pd.read_sql_query(
+        "SELECT employee, metric, value FROM employee_metrics WHERE page = ? AND upload_hash = ?"
+        f" AND metric IN ({', '.join('?' * (len(SMART_COLUMNS) + 2))})",
+        conn, params=(page, upload_hash, 'GP', 'Points', *SMART_COLUMNS),
+    )
+    table = rows.pivot(index='employee', columns='metric', values='value')
+    smart = next((col for col in SMART_COLUMNS if col in table), None)
+    return pd.DataFrame({
+        'gp_cents': money.to_cents(table['GP']) if 'GP' in table else 0,
+        'smart': table[smart].fillna(0) if smart else 0.0,
+        'points': table['Points'] if 'Points' in table else np.nan,
+    }, index=table.index)
+
+
+def daily_increments(conn, page, as_of, upload_hash):
+    # What was booked since the previous snapshot of the same month
+    today = snapshot_metrics(conn, page, upload_hash)
+    previous = conn.execute(
+        "SELECT upload_hash FROM snapshots WHERE page = ? AND period = ? AND as_of < ?"
+        " ORDER BY as_of DESC LIMIT 1",
+        (page, as_of[:7], as_of),
+    ).fetchone()
+    if previous is not None:
+        before = snapshot_metrics(conn, page, previous[0]).reindex(today.index)
+        today['gp_cents'] -= before['gp_cents'].fillna(0).astype('int64')
+        today['smart'] -= before['smart'].fillna(0)
+    return today
+
+
+def shift(conn, page, start, end, sign):
+    # sign 1 moves every window from start to end; -1 moves it back
+    for days in WINDOWS:
+        start_w = days_before(start, days) if start else ''
+        conn.execute(SHIFT, {
+            'page': page, 'days': days, 'sign': sign, 'start': start, 'end': end,
+            'start_w': start_w, 'end_w': days_before(end, days),
+        })
+    conn.execute("DELETE FROM leaderboard_windows WHERE page = ? AND snapshots = 0", (page,))
+
+
+def metric_values(windows):
+    gp = money.to_dollars(windows['gp_cents'])
+    return pd.DataFrame({
+        'GP': gp,
+        'GP Per Smart': (gp / windows['smart'].where(windows['smart'] > 0)).fillna(0),
+        'Points': windows['points_sum'] / windows['points_days'].where(windows['points_days'] > 0),
+    }, index=windows.index)
+
+
+def read_windows(conn, page, days):
+    return pd.read_sql_query(
+        "SELECT employee, gp_cents, smart, points_sum, points_days, snapshots FROM leaderboard_windows"
+        " WHERE page = ? AND days = ?",
+        conn, params=(page, days), index_col='employee',
+    )
+
+
+def update_ranks(conn, page, as_of):
+    # A rank recorded on an earlier date becomes the previous rank; re-ranking
+    # the same date (a re-export) keeps the previous rank it already had
+    for days in WINDOWS:
+        values = metric_values(read_windows(conn, page, days))
+        for metric in METRICS:
+            ranks = values[metric].dropna().rank(method='min', ascending=False).astype('int64')
+            before = {
+                employee: rank if ranked_on < as_of else previous
+                for employee, ranked_on, rank, previous in conn.execute(
+                    "SELECT employee, as_of, rank, previous_rank FROM leaderboard_ranks"
+                    " WHERE page = ? AND days = ? AND metric = ?", (page, days, metric))
+            }
+            conn.execute("DELETE FROM leaderboard_ranks WHERE page = ? AND days = ? AND metric = ?",
+                         (page, days, metric))
+            conn.executemany(
+                "INSERT INTO leaderboard_ranks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(page, days, metric, employee, as_of, int(rank), before.get(employee))
+                 for employee, rank in ranks.items()],
+            )
+
+
+def apply(conn, page, as_of, upload_hash, previous, rank=True):
+    daily = daily_increments(conn, page, as_of, upload_hash)
+    conn.executemany(
+        "INSERT OR REPLACE INTO leaderboard_daily VALUES (?, ?, ?, ?, ?, ?)",
+        [(page, as_of, employee, int(gp_cents), float(smart), None if pd.isna(points) else float(points))
+         for employee, gp_cents, smart, points in daily.itertuples()],
+    )
+    shift(conn, page, previous, as_of, 1)
+    conn.execute("INSERT INTO leaderboard_applied VALUES (?, ?, ?)", (page, as_of, upload_hash))
+    if rank:
+        update_ranks(conn, page, as_of)
+
+
+def undo(conn, page, as_of, previous):
+    shift(conn, page, previous, as_of, -1)
+    conn.execute("DELETE FROM leaderboard_daily WHERE page = ? AND as_of = ?", (page, as_of))
+    conn.execute("DELETE FROM leaderboard_applied WHERE page = ? AND as_of = ?", (page, as_of))
+
+
+def reset(conn, page):
+    for table in ('leaderboard_daily', 'leaderboard_windows', 'leaderboard_ranks', 'leaderboard_applied'):
+        conn.execute(f"DELETE FROM {table} WHERE page = ?", (page,))
+
+
+def sync(conn, page):
+    # Folds snapshots saved since the last update into the windows; returns
+    # the newest as-of date, or None when the page has no history yet
+    conn.execute("BEGIN IMMEDIATE")  # one session updates at a time
+    with conn:
+        saved = conn.execute(
+            "SELECT as_of, upload_hash FROM snapshots WHERE page = ? ORDER BY as_of", (page,)
+        ).fetchall()
+        applied = conn.execute(
+            "SELECT as_of, upload_hash FROM leaderboard_applied WHERE page = ? ORDER BY as_of", (page,)
+        ).fetchall()
+
+        common = 0
+        while common < min(len(saved), len(applied)) and saved[common] == applied[common]:
+            common += 1
+        if common == len(applied) - 1:
+            # Only the newest day changed, i.e. it was re-exported
+            undo(conn, page, applied[-1][0], applied[-2][0] if common else '')
+        elif common < len(applied):
+            reset(conn, page)
+            common = 0
+
+        previous = saved[common - 1][0] if common else ''
+        for i in range(common, len(saved)):
+            as_of, upload_hash = saved[i]
+            # Only the last two need ranks: the current rank and the one before it
+            apply(conn, page, as_of, upload_hash, previous, rank=i >= len(saved) - 2)
+            previous = as_of
+    return date.fromisoformat(saved[-1][0]) if saved else None
+
+
+def update(page, path=history.DB_PATH):
+    # The on_save hook for history.render_panel
+    with closing(connect(path)) as conn:
+        return sync(conn, page)
+
+
+# ======================================================
+# 🥇 TOP-K QUERIES
+# ======================================================
+
+def top_k(values, k):
+    # Positions of the k largest values, largest first: a partial selection
+    # of k, then a sort of just those k
+    k = min(k, len(values))
+    if k == 0:
+        return np.array([], dtype='int64')
+    top = np.argpartition(-values, k - 1)[:k]
+    return top[np.argsort(-values[top], kind='stable')]
+
+
+def leaderboard(page, days, metric, k=10, path=history.DB_PATH):
+    conn = reader(path)
+    if conn is None:
+        return pd.DataFrame(columns=['Rank', 'Employee', metric, 'Change', 'Previous Rank'])
+    with closing(conn):
+        values = metric_values(read_windows(conn, page, days))[metric].dropna()
+        ranks = pd.read_sql_query(
+            "SELECT employee, rank, previous_rank FROM leaderboard_ranks WHERE page = ? AND days = ? AND metric = ?",
+            conn, params=(page, days, metric), index_col='employee',
+        )
+
+    top = values.iloc[top_k(values.to_numpy('float64'), k)]
+    table = ranks.reindex(top.index)
+    table['Change'] = table['previous_rank'] - table['rank']
+    table[metric] = top
+    table.index.name = 'Employee'
+    return table.rename(columns={'rank': 'Rank', 'previous_rank': 'Previous Rank'}).reset_index()[
+        ['Rank', 'Employee', metric, 'Change', 'Previous Rank']
+    ]
+
+
+def movement(change):
+    if pd.isna(change):
+        return "🆕"
+    if change > 0:
+        return f"▲ {change:.0f}"
+    if change < 0:
+        return f"▼ {-change:.0f}"
+    return "–"
+
+
+# ======================================================
+# 🖥️ PAGE PANEL
+# ======================================================
+
+def render_panel(page, path=history.DB_PATH):
+    st.subheader("🏆 Leaderboards")
+    conn = reader(path)
+    latest = has_points = None
+    if conn is not None:
+        with closing(conn):
+            latest = conn.execute("SELECT MAX(as_of) FROM leaderboard_applied WHERE page = ?", (page,)).fetchone()[0]
+            has_points = conn.execute(
+                "SELECT 1 FROM leaderboard_windows WHERE page = ? AND points_days > 0 LIMIT 1", (page,)
+            ).fetchone()
+    if latest is None:
+        st.caption("Save a snapshot to start the leaderboards.")
+        return
+    latest = date.fromisoformat(latest)
+
+    metrics = METRICS if has_points else [m for m in METRICS if m != 'Points']
+    col_days, col_metric, col_k = st.columns(3)
+    days = col_days.radio("Window", WINDOWS, format_func=lambda d: f"{d} days", horizontal=True,
+                          key=f"{page}_leaderboard_days")
+    metric = col_metric.selectbox("Rank by", metrics, key=f"{page}_leaderboard_metric")
+    k = col_k.number_input("Show top", min_value=1, max_value=500, value=10, key=f"{page}_leaderboard_k")
+
+    table = leaderboard(page, days, metric, int(k), path)
+    table['Change'] = table['Change'].map(movement)
+    st.dataframe(table, use_container_width=True, hide_index=True,
+                 column_config=display.column_config({'Rank': 'count', 'Previous Rank': 'count',
+                                                      metric: display.LEADERBOARD[metric]}))
+    st.caption(f"Trailing {days} days to {latest:%b %d, %Y}. Changes are against the previous snapshot.")
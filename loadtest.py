@@ -0,0 +1,301 @@
+# ======================================================
+# 🏋️ CONCURRENT-SESSION LOAD TEST
+# ======================================================
+# Drives the Streamlit pages headlessly through Streamlit's app-testing
+# API, entering through app.py like a browser would. N simulated sessions
+# run side by side on worker threads; each one opens a page, uploads a
+# synthetic export (sizes cycle through --rows, a fresh export every round)
+# and clicks through the page's widgets. All sessions share this process's
+# caches and job registry, as they would on one server.
+#
+# The test API swaps process-wide globals (the runtime, st.secrets) for
+# every script run, so runs take turns under a lock. Background jobs still
+# run concurrently, and the time a session waits for its turn is reported
+# as queueing: with one Python process serving a dozen managers, that is
+# what they wait for too.
+#
+# Reports per-interaction latency percentiles, how much each session's
+# st.session_state grows, and process RSS sampled through the run. RSS
+# that keeps climbing round after round, once the caches are full, is a
+# leak.
+#
+#   python loadtest.py --sessions 12 --rows 1000 50000 200000
+#   python loadtest.py --pages confcall --sessions 4 --rounds 5 --save load.json
+
+import argparse
+import json
+import os
+import pickle
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import synth
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PAGES = {
+    'confcall': 'confcall.py',
+    'tuesdaycall': 'tuesdaycall.py',
+    'calculator': 'calculator.py',
+}
+
+PERCENTILES = [0.5, 0.9, 0.95, 0.99]
+SAMPLE_SECONDS = 0.25
+
+RUN_LOCK = threading.Lock()
+
+
+# ======================================================
+# 🖱️ SCRIPTED INTERACTIONS
+# ======================================================
+# Each step changes one widget; the page is then rerun until its
+# background job (if any) has finished, and that whole wait is the latency.
+
+def widget(at, kind, label):
+    return next(w for w in getattr(at, kind) if w.label == label)
+
+
+def upload(data):
+    return lambda at: at.file_uploader[0].set_value(("KPI Details.csv", data, "text/csv"))
+
+
+def confcall_steps(data):
+    def deselect(at):
+        employees = at.multiselect[0]
+        employees.set_value(employees.value[:max(1, len(employees.value) // 2)])
+
+    def select_all(at):
+        at.multiselect[0].set_value(at.multiselect[0].options)
+
+    return [
+        ("upload", upload(data)),
+        ("deselect half", deselect),
+        ("select all", select_all),
+        ("what-if tier", lambda at: widget(at, 'selectbox', "Tier to change").set_value('Score GP')),
+    ]
+
+
+def tuesday_steps(data):
+    return [
+        ("upload", upload(data)),
+        ("projection method", lambda at: widget(at, 'selectbox', "🔮 Projection method").set_value('business')),
+        ("as-of date", lambda at: widget(at, 'date_input', "📅 As-of date").set_value(date.today() - timedelta(days=3))),
+    ]
+
+
+def calculator_steps(data):
+    return [
+        ("upload", upload(data)),
+        ("single employee", lambda at: at.radio[0].set_value("👤 Single employee")),
+        # Typed in: GP is only filled in when the export has an Ordonez row
+        ("total GP", lambda at: widget(at, 'text_input', "Enter Total GP Earned ($)").set_value("12500.00")),
+        ("deductions", lambda at: widget(at, 'text_input', "Enter Deductions ($)").set_value("125.00")),
+        ("reason", lambda at: widget(at, 'text_input', "Please explain the reason for this deduction:").set_value("Load test")),
+        ("whole store", lambda at: at.radio[0].set_value("🏬 Whole store")),
+    ]
+
+
+SCENARIOS = {
+    'confcall': confcall_steps,
+    'tuesdaycall': tuesday_steps,
+    'calculator': calculator_steps,
+}
+
+
+# ======================================================
+# 📏 MEASUREMENTS
+# ======================================================
+
+def rss_bytes():
+    # Current resident set size; peak RSS where /proc isn't available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def value_bytes(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum()) if isinstance(value, pd.DataFrame) \
+            else int(value.memory_usage(deep=True))
+    try:
+        return len(pickle.dumps(value))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def state_bytes(at):
+    return sum(value_bytes(value) for value in at.session_state.to_dict().values())
+
+
+class RssSampler:
+    # Samples RSS on a background thread for the whole run
+    def __init__(self):
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.samples.append((time.monotonic(), rss_bytes()))
+            self._stop.wait(SAMPLE_SECONDS)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.samples.append((time.monotonic(), rss_bytes()))
+
+
+# ======================================================
+# 👥 SESSIONS
+# ======================================================
+
+def run(at, timeout):
+    # Returns the seconds spent waiting for another session's run to finish
+    start = time.perf_counter()
+    with RUN_LOCK:
+        queued = time.perf_counter() - start
+        at.run(timeout=timeout)
+    return queued
+
+
+def settle(at, timeout):
+    deadline = time.monotonic() + timeout
+    queued = run(at, timeout)
+    while at.get('progress') and time.monotonic() < deadline:
+        time.sleep(0.1)
+        queued += run(at, timeout)
+    return queued
+
+
+def run_session(page, session, rows, rounds, employees, timeout):
+    at = AppTest.from_file(os.path.join(HERE, 'app.py'), default_timeout=timeout)
+    at.secrets['app_password'] = 'load-test'
+    at.session_state['authenticated'] = True
+    at.session_state['internal_authenticated'] = True
+    run(at, timeout)
+    at.switch_page(PAGES[page])
+    run(at, timeout)
+
+    records = []
+    for round_no in range(rounds):
+        # A different export every round, so the caches keep taking new entries
+        seed = session * rounds + round_no
+        data = synth.export_bytes(synth.generate_export(rows, employees, seed=seed))
+        for interaction, action in SCENARIOS[page](data):
+            error, queued = None, 0.0
+            start = time.perf_counter()
+            try:
+                action(at)
+                queued = settle(at, timeout)
+            except Exception as e:  # a missing widget or a timeout
+                error = f"{type(e).__name__}: {e}"
+            seconds = time.perf_counter() - start
+            errors = [error] if error else [str(e.value) for e in [*at.exception, *at.error]]
+            records.append({
+                'page': page, 'session': session, 'rows': rows, 'round': round_no,
+                'interaction': interaction, 'seconds': seconds, 'queued': queued,
+                'state_bytes': state_bytes(at), 'rss_bytes': rss_bytes(),
+                'errors': errors,
+            })
+    return records
+
+
+def latency_table(df):
+    grouped = df.groupby(['page', 'interaction'], sort=False)['seconds']
+    table = grouped.quantile(PERCENTILES).unstack()
+    table.columns = [f"p{int(q * 100)}" for q in PERCENTILES]
+    table['max'] = grouped.max()
+    table['queued p50'] = df.groupby(['page', 'interaction'], sort=False)['queued'].median()
+    table['count'] = grouped.size()
+    return table.reset_index()
+
+
+def state_table(df):
+    # Per session: session_state size after the first and the last interaction
+    per_session = df.groupby(['page', 'session']).agg(
+        first_kb=('state_bytes', lambda b: b.iloc[0] / 1024),
+        last_kb=('state_bytes', lambda b: b.iloc[-1] / 1024),
+    )
+    per_session['growth_kb'] = per_session['last_kb'] - per_session['first_kb']
+    return per_session.groupby('page').agg(
+        sessions=('last_kb', 'size'), mean_last_kb=('last_kb', 'mean'),
+        max_last_kb=('last_kb', 'max'), max_growth_kb=('growth_kb', 'max'),
+    ).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit pages with concurrent sessions.")
+    parser.add_argument('--sessions', type=int, default=12, help="simulated sessions, all started at once")
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES),
+                        help="pages to spread the sessions over (round robin)")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 20000, 100000],
+                        help="export sizes, cycled over the sessions")
+    parser.add_argument('--employees', type=int, default=40)
+    parser.add_argument('--rounds', type=int, default=2, help="scenario repeats per session, fresh export each")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds one interaction may take")
+    parser.add_argument('--save', help="write every measurement to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Keep load-test runs out of the real snapshot history and upload store
+    scratch = tempfile.mkdtemp(prefix='wzm_load_')
+    os.environ.setdefault('WZM_HISTORY_DB', os.path.join(scratch, 'history.sqlite3'))
+    os.environ.setdefault('WZM_UPLOAD_STORE', os.path.join(scratch, 'uploads'))
+
+    sessions = [(args.pages[i % len(args.pages)], i, args.rows[i % len(args.rows)])
+                for i in range(args.sessions)]
+    print(f"🏋️ {args.sessions} sessions × {args.rounds} rounds on {', '.join(args.pages)}")
+
+    rss_start = rss_bytes()
+    started = time.monotonic()
+    with RssSampler() as sampler, ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        futures = [pool.submit(run_session, page, i, rows, args.rounds, args.employees, args.timeout)
+                   for page, i, rows in sessions]
+        records = [record for future in futures for record in future.result()]
+    elapsed = time.monotonic() - started
+
+    df = pd.DataFrame(records)
+    print("\n⏱️ Latency per interaction (seconds)")
+    print(latency_table(df).to_string(index=False, float_format=lambda x: f"{x:,.3f}"))
+    print("\n🧠 st.session_state per session (KB)")
+    print(state_table(df).to_string(index=False, float_format=lambda x: f"{x:,.1f}"))
+
+    samples = pd.Series([rss for _, rss in sampler.samples]) / 2**20
+    per_round = df.groupby('round')['rss_bytes'].max() / 2**20
+    print(f"\n📈 RSS: start {rss_start / 2**20:,.0f} MB · peak {samples.max():,.0f} MB · "
+          f"end {samples.iloc[-1]:,.0f} MB · {elapsed:,.1f}s wall")
+    print("   max RSS by round: " + ", ".join(f"#{r + 1} {mb:,.0f} MB" for r, mb in per_round.items()))
+
+    errors = df[df['errors'].str.len() > 0]
+    for r in errors.itertuples():
+        print(f"⚠️ {r.page} session {r.session} round {r.round + 1} {r.interaction}: {'; '.join(r.errors)}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'args': vars(args), 'elapsed': elapsed,
+                'rss_samples': [{'t': t - started, 'rss_bytes': rss} for t, rss in sampler.samples],
+                'records': records,
+            }, f, indent=2)
+    shutil.rmtree(scratch, ignore_errors=True)
+    return 1 if len(errors) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,18 @@
+# ======================================================
+# 🧭 PAGE MENU
+# ======================================================
+# The pages of app.py, by schema name. Titles live here once, so the
+# navigation menu and the wrong-export hints (upload_store.require_page)
+# always name the same page. Plain data only: app.py reads it before the
+# login screen.
+
+PAGES = {
+    'tuesdaycall': {'path': "tuesdaycall.py", 'title': "Current Sales Performance", 'icon': "📊"},
+    'confcall': {'path': "confcall.py", 'title': "Commissions/Results", 'icon': "📈"},
+    'calculator': {'path': "calculator.py", 'title': "Commission Calculator", 'icon': "🧮"},
+}
+
+# Report pages a wrong export can be routed to
+REPORT_PAGES = ['confcall', 'tuesdaycall']
+
+DEFAULT_PAGE = 'tuesdaycall'
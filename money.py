@@ -0,0 +1,100 @@
+# ======================================================
+# 💲 EXACT MONEY ARITHMETIC
+# ======================================================
+# Money is summed, multiplied by rates and projected as int64 cents, so
+# store and district totals are payroll-exact however many rows go in.
+# Report tables keep GP in dollars (display formats and the Score GP tiers
+# are in dollars), but every sum / rate / projection converts to cents
+# first and back once at the end, so a dollar value is always a whole
+# number of cents. Rates are basis points (18% = 1800) and results round
+# half away from zero to the cent. "$1,234.56" strings only appear at the
+# edge (format_cents, display.py).
+#
+#   cents = money.parse_cents(df['GP'])          # "$1,234.56" → 123456
+#   royalty = money.apply_rate(cents, 1800)      # 18%, rounded to the cent
+
+import numpy as np
+import pandas as pd
+
+# Columns that hold money: "$1,234.56" strings in the export, dollars in reports
+MONEY_COLUMNS = ['GP']
+
+# Anything the fast path can't take: "(12.50)", "-$5", "12", "12.345", ".5"
+LOOSE_PATTERN = r'^(?P<open>\()?(?P<sign>-)?(?P<whole>\d*)(?:\.(?P<frac>\d*))?\)?$'
+
+
+def to_cents(dollars):
+    # Dollar floats (already whole cents, give or take float noise) → int64; blanks are 0
+    return np.rint(np.nan_to_num(np.asarray(dollars, dtype='float64')) * 100).astype('int64')
+
+
+def to_dollars(cents):
+    return np.asarray(cents, dtype='int64') / 100
+
+
+def total(dollars):
+    # Exact sum of a dollar column
+    return to_cents(dollars).sum() / 100
+
+
+def percent_bps(percent):
+    # 18 (%) → 1800 basis points
+    return np.rint(np.asarray(percent, dtype='float64') * 100).astype('int64')
+
+
+def apply_rate(cents, bps):
+    # cents × rate, rounded half away from zero to the cent
+    product = np.asarray(cents, dtype='int64') * np.asarray(bps, dtype='int64')
+    return np.sign(product) * ((np.abs(product) + 5_000) // 10_000)
+
+
+def divide(cents, share):
+    # cents / share (a float fraction), rounded half away from zero to the cent
+    quotient = np.asarray(cents, dtype='int64') / share
+    return (np.sign(quotient) * np.floor(np.abs(quotient) + 0.5)).astype('int64')
+
+
+def _parse_loose(cleaned):
+    # (cents, parsed) for the odd spellings; a third decimal rounds half up
+    parts = cleaned.str.extract(LOOSE_PATTERN)
+    whole, frac = parts['whole'].fillna(''), parts['frac'].fillna('')
+    parsed = (parts['whole'].notna() | parts['frac'].notna()) & ((whole != '') | (frac != ''))
+    whole = pd.to_numeric(whole.where(whole != '', '0'), errors='coerce').fillna(0).astype('int64')
+    thousandths = frac.str.ljust(3, '0').str[:3].astype('int64')
+    cents = whole * 100 + (thousandths + 5) // 10
+    negative = parts['open'].notna() | parts['sign'].notna()
+    cents = cents.where(~negative, -cents).where(parsed, 0)
+    return cents.to_numpy('int64'), parsed.to_numpy(bool)
+
+
+def parse_cents(values):
+    # "$1,234.56" strings (or plain numbers) → int64 cents; blanks and junk are 0
+    # (categorical columns go through ingest.parse_distinct first)
+    series = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(series):
+        return to_cents(series)
+
+    cleaned = series.astype(str).str.replace(r'[\s$,]', '', regex=True).where(series.notna(), '')
+    # Power BI writes exactly two decimals; for those the nearest double times
+    # 100 rounds back to the exact cents (up to ~$90 billion)
+    exact = cleaned.str.fullmatch(r'-?\d{1,11}\.\d\d').to_numpy(bool)
+    cents = np.zeros(len(series), dtype='int64')
+    cents[exact] = to_cents(pd.to_numeric(cleaned[exact]))
+    if not exact.all():
+        cents[~exact] = _parse_loose(cleaned[~exact])[0]
+    return cents
+
+
+def parse_amount(text):
+    # One typed amount ("1234.5", "$1,234.50"); raises ValueError if it isn't one
+    cleaned = pd.Series([str(text)]).str.replace(r'[\s$,]', '', regex=True)
+    cents, parsed = _parse_loose(cleaned)
+    if not parsed[0]:
+        raise ValueError(f"Not a dollar amount: {text!r}")
+    return int(cents[0])
+
+
+def format_cents(cents):
+    cents = int(cents)
+    sign = '-' if cents < 0 else ''
+    return f"{sign}${abs(cents) // 100:,}.{abs(cents) % 100:02d}"
@@ -0,0 +1,261 @@
+# ======================================================
+# 🔁 REPORT PIPELINES
+# ======================================================
+# Cleaning → grouping → scoring → formatting for the confcall scorecard
+# and the tuesdaycall performance table. The Streamlit pages and the
+# batch CLI both call these; nothing here touches the UI.
+
+from calendar import monthrange
+
+import numpy as np
+import pandas as pd
+
+import identity
+import money
+import projection
+import scoring
+
+
+# ======================================================
+# 🧑‍💼 SHARED HELPERS
+# ======================================================
+
+def normalize_employees(df):
+    # Drop placeholder / single-token names; every spelling of a person shares one ID
+    ids, employees = identity.resolve(df['Employee'])
+    keep = ids >= 0
+    df = df[keep].copy()
+    df['Employee'] = identity.employee_categorical(ids[keep], employees)
+    return df
+
+
+def with_cents(df):
+    # Money columns as int64 cents, so groupby sums are exact
+    return df.assign(**{col: money.to_cents(df[col]) for col in money.MONEY_COLUMNS if col in df.columns})
+
+
+def from_cents(df):
+    return df.assign(**{col: money.to_dollars(df[col]) for col in money.MONEY_COLUMNS if col in df.columns})
+
+
+def month_progress(today):
+    days_elapsed = today.day
+    days_in_month = monthrange(today.year, today.month)[1]
+    return days_elapsed, days_in_month
+
+
+# ======================================================
+# 📈 CONFCALL — COMMISSION SCORECARD
+# ======================================================
+
+CONFCALL_NUMERIC = [
+    'News', 'Upgrades', 'SMT GA', 'SMB GA', 'VZ Perks Rate (%)',
+    'Premium Unlim (%)', 'VMP', 'GP', 'SMT QTY', 'FIOS/VHI'
+]
+
+# Shown in the cleaned table but left off the commission scorecard
+CONFCALL_EXCLUDED = ['josh ordonez', 'thimotee wiguen']
+
+
+def clean_confcall(df):
+    df = df.rename(columns={
+        'SMT Qty': 'SMT QTY',
+        'Employee Full Name': 'Employee',
+        'GA': 'News',
+        'VZ Perks Rate': 'VZ Perks Rate (%)',
+        '(RQ) Consumer SMT Prem Unlim %': 'Premium Unlim (%)',
+        'VMP Take Rate': 'VMP'
+    })
+
+    # Combine VZ FWA + FIOS into one column
+    df['FIOS/VHI'] = df['VZ FWA GA'] + df['VZ FIOS GA']
+    df = df.drop(columns=['VZ FWA GA', 'VZ FIOS GA'])
+
+    df[CONFCALL_NUMERIC] = df[CONFCALL_NUMERIC].fillna(0)
+    return df
+
+
+def group_confcall(df):
+    return from_cents(with_cents(df).groupby('Employee', as_index=False, observed=True)[CONFCALL_NUMERIC].sum())
+
+
+def add_confcall_metrics(df):
+    df['Total GA'] = df['News'] + df['Upgrades']
+    df['Ratio'] = np.where(df['Upgrades'] != 0, df['News'] / df['Upgrades'], 0).round(2)
+    df['GP Per Smart'] = np.where(df['SMT QTY'] != 0, df['GP'] / df['SMT QTY'], 0).round(2)
+    return df
+
+
+def aggregate_confcall(df):
+    return add_confcall_metrics(group_confcall(df))
+
+
+def confcall_excluded(df):
+    return df['Employee'].isin([identity.canonical(name) for name in CONFCALL_EXCLUDED])
+
+
+def confcall_summary(df):
+    # Numeric per-employee table plus a TOTAL row; formatting happens at render time
+    sum_cols = ['News', 'Upgrades', 'SMT GA', 'SMB GA', 'GP', 'SMT QTY', 'Total GA', 'FIOS/VHI']
+    totals = {col: df[col].sum() for col in sum_cols}
+    totals['GP'] = money.total(df['GP'])
+    total_row = {
+        'Employee': 'TOTAL',
+        **totals,
+        'VZ Perks Rate (%)': df['VZ Perks Rate (%)'].mean(),
+        'Premium Unlim (%)': df['Premium Unlim (%)'].mean(),
+        'VMP': df['VMP'].mean(),
+        'Ratio': df['Ratio'].mean(),
+        'GP Per Smart': totals['GP'] / totals['SMT QTY'] if totals['SMT QTY'] > 0 else 0.0,
+    }
+
+    summary = df.assign(Employee=df['Employee'].astype(str))
+    return pd.concat([summary, pd.DataFrame([total_row])], ignore_index=True)[df.columns]
+
+
+SCORECARD_COLUMNS = ['Employee', *scoring.SCORE_TIERS, 'Points', 'Commission %', 'Commission Earned']
+
+
+def confcall_reports(summary):
+    scorecard = scoring.score_frame(summary[~confcall_excluded(summary)].reset_index(drop=True))
+    return confcall_summary(summary), scorecard[SCORECARD_COLUMNS]
+
+
+def run_confcall(df):
+    df = normalize_employees(clean_confcall(df))
+    return confcall_reports(aggregate_confcall(df))
+
+
+# ======================================================
+# 📊 TUESDAYCALL — PERFORMANCE TABLE
+# ======================================================
+
+TUESDAY_AGG = {
+    'News': 'sum', 'Upgrades': 'sum', 'SMT GA': 'sum', 'Perks': 'mean', 'VMP': 'mean',
+    'GP': 'sum', 'SMB GA': 'sum', 'Premium Unlimited': 'mean', 'VZ FWA GA': 'sum',
+    'VZ FIOS GA': 'sum', 'VZPH': 'sum', 'Verizon Visa': 'sum', 'SMT Qty': 'sum'
+}
+
+TUESDAY_DISPLAY_COLUMNS = [
+    'Employee', 'News', 'Upgrades', 'Ratio', 'SMT GA',
+    'Perks', 'VMP', 'Premium Unlimited', 'GP',
+    'GP Per Smart', 'SMB GA', 'VZPH', 'Verizon Visa', 'VHI/FIOS', 'Projected GP'
+]
+
+# Rate columns: averaged, not summed, in the TOTAL row and across months
+TUESDAY_AVERAGE_COLUMNS = ['Ratio', 'Perks', 'VMP', 'Premium Unlimited', 'GP Per Smart']
+
+THRESHOLDS = {
+    'Ratio': {'value': 50, 'higher_is_better': True},
+    'SMB GA': {'value': 3, 'higher_is_better': True},
+    'Perks': {'value': 56, 'higher_is_better': True},
+    'VMP': {'value': 55, 'higher_is_better': True},
+    'Premium Unlimited': {'value': 65, 'higher_is_better': True},
+    'SMT GA': {'value': 30, 'higher_is_better': True},
+    'GP Per Smart': {'value': 460, 'higher_is_better': True},
+    'VHI/FIOS': {'value': 7, 'higher_is_better': True},
+    'VZPH': {'value': 2, 'higher_is_better': True},
+    'Verizon Visa': {'value': 1, 'higher_is_better': True}
+}
+
+
+def clean_tuesday(df):
+    df = df.copy()
+
+    # Combine VZ Premium % and CCRS SMB Prem Unl % into one column
+    df['Premium Unlimited'] = df[['VZ Premium %', '(CCRS) SMB Prem Unl %']].mean(axis=1)
+
+    df = df.rename(columns={
+        'Employee Full Name': 'Employee',
+        'GA': 'News',
+        'VZ Perks Rate': 'Perks',
+        'VMP Take Rate': 'VMP',
+        'VZPH Qty': 'VZPH',
+        'VZ CC QTY': 'Verizon Visa'
+    })
+    return df
+
+
+def fill_tuesday(df):
+    # Blank metrics count as zero (and as a row for the means); store columns stay as they are
+    return df.fillna(dict.fromkeys(TUESDAY_AGG, 0))
+
+
+def group_tuesday(df):
+    grouped = with_cents(fill_tuesday(df)).groupby('Employee', as_index=False, observed=True).agg(TUESDAY_AGG)
+    return from_cents(grouped)
+
+
+def add_tuesday_metrics(df, as_of, method='calendar', curve=None):
+    df['Ratio'] = np.where(df['Upgrades'] != 0, df['News'] / df['Upgrades'] * 100, 0)
+    df['GP Per Smart'] = np.where(df['SMT Qty'] != 0, df['GP'] / df['SMT Qty'], 0)
+    df['VHI/FIOS'] = df['VZ FWA GA'] + df['VZ FIOS GA']
+    df['Projected GP'] = projection.project(df['GP'], as_of, method, curve)
+    return df
+
+
+def tuesday_table(df_grouped):
+    # Filter out employees with all zeros
+    df_filtered = df_grouped[(df_grouped.drop(columns='Employee') != 0).any(axis=1)]
+
+    # Add TOTAL row
+    summary_data = df_filtered.drop(columns='Employee').sum(numeric_only=True)
+
+    for col in TUESDAY_AVERAGE_COLUMNS:
+        if col in df_filtered.columns:
+            summary_data[col] = df_filtered[col].mean()
+
+    summary_data['GP'] = money.total(df_filtered['GP'])
+    summary_data['Projected GP'] = money.total(df_filtered['Projected GP'])
+
+    summary_row = pd.DataFrame([summary_data])
+    summary_row.insert(0, 'Employee', 'TOTAL')
+
+    return df_filtered, pd.concat([df_filtered, summary_row], ignore_index=True)
+
+
+def tuesday_display(df_final):
+    # Display columns, still numeric; Premium Unlimited always as a percent
+    df_display = df_final[TUESDAY_DISPLAY_COLUMNS].copy()
+    df_display['Employee'] = df_display['Employee'].astype(str)
+    df_display['Premium Unlimited'] = premium_percent(df_display['Premium Unlimited'])
+    return df_display
+
+
+def premium_percent(values):
+    # Premium Unlimited arrives either as a fraction or as a percent
+    return values.where(values > 1, values * 100)
+
+
+def goal_mask(values, col):
+    threshold = THRESHOLDS[col]
+    # Compare at the precision shown in the table
+    if col == 'Premium Unlimited':
+        values = premium_percent(values)
+    values = values.round(0 if col in ['Ratio', 'Premium Unlimited'] else 2)
+    if threshold['higher_is_better']:
+        return values >= threshold['value']
+    return values <= threshold['value']
+
+
+def goal_styles(df_values, columns):
+    styles = pd.DataFrame('', index=df_values.index, columns=columns)
+    for col in THRESHOLDS:
+        if col in styles.columns:
+            styles[col] = np.where(goal_mask(df_values[col], col),
+                                   'background-color: lightgreen', 'background-color: lightcoral')
+    return styles
+
+
+def style_tuesday(df_display):
+    styles = goal_styles(df_display, df_display.columns)
+    return df_display.style.apply(lambda _: styles, axis=None)
+
+
+def tuesday_reports(df_grouped, as_of, method='calendar', curve=None):
+    return tuesday_table(add_tuesday_metrics(df_grouped, as_of, method, curve))
+
+
+def run_tuesday(df, as_of, method='calendar', curve=None):
+    df = normalize_employees(clean_tuesday(df))
+    return tuesday_reports(group_tuesday(df), as_of, method, curve)
@@ -0,0 +1,122 @@
+# ======================================================
+# 🩺 PER-STAGE PROFILING
+# ======================================================
+# Opt-in diagnostics for the Streamlit pages. Turn it on with ?profile=1
+# in the URL or the sidebar toggle; each wrapped stage records wall time,
+# peak traced memory and row count, shown in a collapsible panel and
+# optionally appended to a JSONL log.
+#
+# tracemalloc is process-wide and every session is a thread of the same
+# process, so tracing is reference-counted: it starts with the first
+# profiled stage in any session and stops after the last one, and the peak
+# is only reset when no other stage is in progress. A peak can therefore
+# include other sessions' allocations, and while anyone profiles, every
+# session runs slower.
+#
+#   profiler = profiling.StageProfiler("confcall")
+#   with profiler.stage("parse") as stage:
+#       df = upload_store.load_data(data, "calculator", digest)
+#       stage["rows"] = len(df)
+#   profiler.render()
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+LOG_PATH = os.environ.get("WZM_PROFILE_LOG", "profile_log.jsonl")
+
+_trace_lock = threading.Lock()
+_traced_stages = 0
+_owns_tracing = False
+
+
+def _start_tracing():
+    global _traced_stages, _owns_tracing
+    with _trace_lock:
+        if _traced_stages == 0:
+            # Leave tracing alone if something else (python -X tracemalloc) started it
+            _owns_tracing = not tracemalloc.is_tracing()
+            if _owns_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        _traced_stages += 1
+
+
+def _stop_tracing():
+    # Returns the peak traced memory since the oldest stage still in progress began
+    global _traced_stages
+    with _trace_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _traced_stages -= 1
+        if _traced_stages == 0 and _owns_tracing:
+            tracemalloc.stop()
+    return peak
+
+
+def profiling_requested():
+    requested = st.query_params.get("profile", "").lower() in ("1", "true", "yes")
+    return st.sidebar.toggle("🩺 Profile this page", value=requested)
+
+
+class StageProfiler:
+    def __init__(self, page, enabled=None):
+        self.page = page
+        self.enabled = profiling_requested() if enabled is None else enabled
+        self.records = []
+
+    @contextmanager
+    def stage(self, name):
+        record = {"stage": name, "rows": None}
+        if not self.enabled:
+            yield record
+            return
+
+        _start_tracing()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            record["peak_mb"] = _stop_tracing() / 2**20
+            self.records.append(record)
+
+    def add_job(self, job):
+        # Stages that ran on a background worker (see jobs.py); timed there, memory not traced
+        if not self.enabled:
+            return
+        for name in job.stages:
+            if name in job.seconds:
+                self.records.append({
+                    "stage": f"{name} (background)", "seconds": job.seconds[name],
+                    "peak_mb": None, "rows": job.rows[name],
+                })
+
+    def render(self):
+        if not self.enabled or not self.records:
+            return
+
+        with st.expander("🩺 Diagnostics", expanded=False):
+            table = pd.DataFrame(self.records)[["stage", "seconds", "peak_mb", "rows"]]
+            st.dataframe(table, hide_index=True, column_config={
+                "seconds": st.column_config.NumberColumn("Wall time (s)", format="%.3f"),
+                "peak_mb": st.column_config.NumberColumn("Peak memory, all sessions (MB)", format="%.1f"),
+                "rows": st.column_config.NumberColumn("Rows", format="%d"),
+            })
+            st.caption(f"Total: {table['seconds'].sum():.3f}s. Peak memory is traced process-wide, so it "
+                       "includes whatever other sessions allocated during the stage.")
+
+            if st.checkbox(f"📝 Append to {LOG_PATH}", key=f"profile_log_{self.page}"):
+                self.append_log()
+
+    def append_log(self, path=LOG_PATH):
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        with open(path, "a") as f:
+            for record in self.records:
+                f.write(json.dumps({"timestamp": timestamp, "page": self.page, **record}) + "\n")
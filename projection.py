@@ -0,0 +1,99 @@
+# ======================================================
+# 🔮 MONTH-END PROJECTIONS
+# ======================================================
+# Projects month-to-date values (GP) to the end of the month for every
+# employee at once. The as-of date is always passed in, so a projection can
+# be reproduced later or computed for many dates in one call (as_of may be
+# a single date or an array of dates matching the values).
+#
+#   calendar  — pace per calendar day
+#   business  — pace per store-open day (STORE_WEEKMASK minus holidays)
+#   curve     — share of the month's GP usually booked by this point,
+#               taken from completed months in the snapshot history
+
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+import money
+
+METHODS = {
+    'calendar': "Calendar days",
+    'business': "Store-open days",
+    'curve': "Historical daily curve",
+}
+
+# Days the stores open, Monday first (numpy busday weekmask)
+STORE_WEEKMASK = '1111111'
+
+# Resolution of the historical curve, as a fraction of the month
+CURVE_POINTS = 32
+
+
+@lru_cache(maxsize=None)
+def store_holidays(year):
+    # New Year's Day, Thanksgiving (4th Thursday of November), Christmas
+    november_first = date(year, 11, 1)
+    thanksgiving = 1 + (3 - november_first.weekday()) % 7 + 21
+    return (date(year, 1, 1), date(year, 11, thanksgiving), date(year, 12, 25))
+
+
+def month_bounds(as_of):
+    day = np.asarray(as_of, dtype='datetime64[D]')
+    month = day.astype('datetime64[M]')
+    return day, month.astype('datetime64[D]'), (month + 1).astype('datetime64[D]')
+
+
+def calendar_share(as_of):
+    day, start, end = month_bounds(as_of)
+    return ((day - start).astype(int) + 1) / (end - start).astype(int)
+
+
+def business_share(as_of, weekmask=STORE_WEEKMASK):
+    day, start, end = month_bounds(as_of)
+    years = range(int(str(start.min())[:4]), int(str(end.max())[:4]) + 1)
+    holidays = [d for year in years for d in store_holidays(year)]
+    opened = np.busday_count(start, day + 1, weekmask=weekmask, holidays=holidays)
+    total = np.busday_count(start, end, weekmask=weekmask, holidays=holidays)
+    return opened / total
+
+
+def daily_curve(totals):
+    # totals: period, as_of, value rows (see history.metric_totals). Only months
+    # with a snapshot on their last day are complete enough to learn from.
+    grid = np.linspace(0, 1, CURVE_POINTS)
+    curves = []
+    for _, month in totals.groupby('period'):
+        month = month.sort_values('as_of')
+        as_of = month['as_of'].to_numpy(dtype='datetime64[D]')
+        if calendar_share(as_of[-1]) < 1 or month['value'].iloc[-1] <= 0:
+            continue
+        elapsed = np.concatenate([[0], calendar_share(as_of)])
+        booked = np.concatenate([[0], month['value'].to_numpy() / month['value'].iloc[-1]])
+        curves.append(np.interp(grid, elapsed, booked))
+    if not curves:
+        return None
+    return grid, np.mean(curves, axis=0)
+
+
+def elapsed_share(as_of, method='calendar', curve=None):
+    if method == 'calendar':
+        return calendar_share(as_of)
+    if method == 'business':
+        return business_share(as_of)
+    if method == 'curve':
+        if curve is None:
+            raise ValueError("The curve method needs a historical curve (see daily_curve)")
+        grid, booked = curve
+        return np.interp(calendar_share(as_of), grid, booked)
+    raise ValueError(f"Unknown projection method: {method}")
+
+
+def project(values, as_of, method='calendar', curve=None):
+    # Money in, money out: projected in cents, rounded to the cent
+    cents = money.to_cents(values)
+    share = np.broadcast_to(elapsed_share(as_of, method, curve), cents.shape)
+    # Nothing booked yet (e.g. as-of is a closed day 1): leave the value as is
+    projected = np.where(share > 0, money.divide(cents, np.where(share > 0, share, 1)), cents)
+    return money.to_dollars(projected)
@@ -0,0 +1,60 @@
+# ======================================================
+# 🧮 COMMISSION SCORING ENGINE
+# ======================================================
+# Commission tiers are declared as tables. Each metric scores 1 point
+# plus one point for every threshold it reaches, so [20, 25, 30]
+# means <20 → 1, ≥20 → 2, ≥25 → 3, ≥30 → 4. The average of all scores
+# (Points) picks the commission rate the same way.
+
+import numpy as np
+
+import money
+
+SCORE_TIERS = {
+    'Score SMT': {'metric': 'SMT GA', 'thresholds': [20, 25, 30]},
+    'Score Upgrades': {'metric': 'Upgrades', 'thresholds': [45, 55, 65]},
+    'Score Perks': {'metric': 'VZ Perks Rate (%)', 'thresholds': [25, 40, 55]},
+    'Score VMP': {'metric': 'VMP', 'thresholds': [55, 65, 75]},
+    'Score SMB': {'metric': 'SMB GA', 'thresholds': [3, 5, 7]},
+    'Score Unlimited': {'metric': 'Premium Unlim (%)', 'thresholds': [55, 60, 65]},
+    'Score VHI/FIOS': {'metric': 'FIOS/VHI', 'thresholds': [3, 5, 7]},
+    'Score GP': {'metric': 'GP', 'thresholds': [18201, 30000, 40001]},
+}
+
+# Points → commission rate (% of GP)
+COMMISSION_TIERS = {'thresholds': [1.5, 2.5, 3.5], 'rates': [18, 20, 25, 30]}
+
+# Rates that may be exported as fractions (0.55) instead of percents (55)
+PERCENT_METRICS = ['VZ Perks Rate (%)', 'Premium Unlim (%)', 'VMP']
+
+
+def as_percent(values):
+    values = np.asarray(values, dtype=float)
+    return np.where(values < 1, values * 100, values)
+
+
+def tier_points(values, thresholds):
+    # Missing values never reach a tier
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=-np.inf)
+    return np.searchsorted(np.asarray(thresholds, dtype=float), values, side='right') + 1
+
+
+def commission_rate(points, tiers=COMMISSION_TIERS):
+    rates = np.asarray(tiers['rates'], dtype=float)
+    return rates[tier_points(points, tiers['thresholds']) - 1]
+
+
+def score_frame(df, tiers=SCORE_TIERS, commission_tiers=COMMISSION_TIERS):
+    scored = df.copy()
+    for col in PERCENT_METRICS:
+        if col in scored.columns:
+            scored[col] = as_percent(scored[col])
+
+    for score_col, tier in tiers.items():
+        scored[score_col] = tier_points(scored[tier['metric']], tier['thresholds'])
+
+    scored['Points'] = scored[list(tiers)].mean(axis=1).round(2)
+    scored['Commission %'] = commission_rate(scored['Points'], commission_tiers)
+    earned = money.apply_rate(money.to_cents(scored['GP']), money.percent_bps(scored['Commission %']))
+    scored['Commission Earned'] = money.to_dollars(earned)
+    return scored
@@ -0,0 +1,143 @@
+# ======================================================
+# 🧪 COMMISSION WHAT-IF SIMULATOR
+# ======================================================
+# Scores every employee under many candidate tier / rate configurations at
+# once. Thresholds are stacked into a (configs × metrics × thresholds)
+# array and compared against the (employees × metrics) values by
+# broadcasting, so hundreds of scenarios cost one NumPy pass. The rules
+# are the ones in scoring.py: one point plus one per threshold reached,
+# Points = mean score rounded to 2, rate picked from Points.
+#
+#   scenarios = [simulator.scenario("Current")] + simulator.sweep('Score SMT', 2, range(26, 33))
+#   result = simulator.simulate(df_employees, scenarios)
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+import money
+import scoring
+
+
+def scenario(name, thresholds=None, commission_thresholds=None, rates=None,
+             tiers=scoring.SCORE_TIERS, commission_tiers=scoring.COMMISSION_TIERS):
+    # A full configuration: the current tables with some entries replaced
+    config = {
+        'name': name,
+        'tiers': copy.deepcopy(tiers),
+        'commission_tiers': copy.deepcopy(commission_tiers),
+    }
+    for score_col, values in (thresholds or {}).items():
+        config['tiers'][score_col]['thresholds'] = list(values)
+    if commission_thresholds is not None:
+        config['commission_tiers']['thresholds'] = list(commission_thresholds)
+    if rates is not None:
+        config['commission_tiers']['rates'] = list(rates)
+    return config
+
+
+def sweep(score_col, position, values, base=None):
+    # One scenario per candidate value of a single metric threshold
+    base = base or scenario("Current")
+    scenarios = []
+    for value in values:
+        thresholds = list(base['tiers'][score_col]['thresholds'])
+        thresholds[position] = value
+        scenarios.append(scenario(
+            f"{score_col} #{position + 1} = {value:g}", {score_col: thresholds},
+            tiers=base['tiers'], commission_tiers=base['commission_tiers'],
+        ))
+    return scenarios
+
+
+def rate_sweep(position, values, base=None):
+    # One scenario per candidate Points threshold for a commission rate
+    base = base or scenario("Current")
+    scenarios = []
+    for value in values:
+        thresholds = list(base['commission_tiers']['thresholds'])
+        thresholds[position] = value
+        rate = base['commission_tiers']['rates'][position + 1]
+        scenarios.append(scenario(
+            f"{rate:g}% needs {value:g} pts", commission_thresholds=thresholds,
+            tiers=base['tiers'], commission_tiers=base['commission_tiers'],
+        ))
+    return scenarios
+
+
+def stack(rows):
+    # Ragged threshold lists → one float array padded with +inf (never reached)
+    width = max(len(row) for row in rows)
+    out = np.full((len(rows), width), np.inf)
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = row
+    return out
+
+
+def metric_matrix(df, score_cols):
+    # (employees × metrics), percent metrics normalized like score_frame
+    columns = []
+    for score_col in score_cols:
+        metric = scoring.SCORE_TIERS[score_col]['metric']
+        values = df[metric].to_numpy(dtype=float)
+        columns.append(scoring.as_percent(values) if metric in scoring.PERCENT_METRICS else values)
+    return np.nan_to_num(np.column_stack(columns), nan=-np.inf)
+
+
+def simulate(df, scenarios):
+    # df: per-employee aggregates (as scored on the confcall page)
+    score_cols = list(scoring.SCORE_TIERS)
+    metrics = metric_matrix(df, score_cols)                                   # E × K
+    thresholds = stack([t for s in scenarios for t in
+                        (s['tiers'][col]['thresholds'] for col in score_cols)])
+    thresholds = thresholds.reshape(len(scenarios), len(score_cols), -1)     # C × K × T
+
+    scores = (metrics[None, :, :, None] >= thresholds[:, None, :, :]).sum(axis=-1) + 1   # C × E × K
+    points = scores.mean(axis=-1).round(2)                                    # C × E
+
+    rate_thresholds = stack([s['commission_tiers']['thresholds'] for s in scenarios])   # C × R
+    rate_table = stack([s['commission_tiers']['rates'] for s in scenarios])             # C × R+1
+    tier = (points[:, :, None] >= rate_thresholds[:, None, :]).sum(axis=-1)             # C × E
+    rates = np.take_along_axis(rate_table, tier, axis=1)
+
+    # Payouts in cents, rounded per rep like the scorecard
+    payouts = money.apply_rate(money.to_cents(df['GP'])[None, :], money.percent_bps(rates))
+    return {
+        'rate_options': np.unique(rate_table[np.isfinite(rate_table)]),
+        'names': [s['name'] for s in scenarios],
+        'employees': df['Employee'].astype(str).to_numpy(),
+        'points': points,
+        'rates': rates,
+        'payouts': payouts,  # int64 cents
+    }
+
+
+def summary(result, baseline=0):
+    # One row per scenario: total payout, change vs the baseline scenario, reps per rate
+    payouts = result['payouts']
+    totals = payouts.sum(axis=1)
+    table = pd.DataFrame({
+        'Scenario': result['names'],
+        'Total Payout': money.to_dollars(totals),
+        'Change': money.to_dollars(totals - totals[baseline]),
+        'Reps Changed': (payouts != payouts[baseline]).sum(axis=1),
+    })
+    rates = result['rates']
+    for rate in result['rate_options']:
+        table[f"Reps at {rate:g}%"] = (rates == rate).sum(axis=1)
+    return table
+
+
+def rep_deltas(result, index, baseline=0):
+    # Per-employee effect of one scenario against the baseline
+    return pd.DataFrame({
+        'Employee': result['employees'],
+        'Points': result['points'][baseline],
+        'Scenario Points': result['points'][index],
+        'Commission %': result['rates'][baseline],
+        'Scenario Commission %': result['rates'][index],
+        'Commission Earned': money.to_dollars(result['payouts'][baseline]),
+        'Scenario Commission Earned': money.to_dollars(result['payouts'][index]),
+        'Change': money.to_dollars(result['payouts'][index] - result['payouts'][baseline]),
+    })
@@ -0,0 +1,115 @@
+# ======================================================
+# 🌊 CHUNKED STREAMING AGGREGATION
+# ======================================================
+# For exports too big to load at once (full-year, all-store, transaction
+# level). The CSV is read in chunks; each chunk is cleaned like the
+# in-memory path and folded into running per-employee partials. Every
+# column keeps a running sum plus a per-employee row count, so the
+# tuesdaycall mean columns (Perks, VMP, Premium Unlimited) come out as
+# sum / count exactly as one groupby().mean() over the whole file would.
+# Memory is bounded by the chunk size plus one row per employee.
+#
+#   summary, scorecard = streaming.run_confcall("year.csv")
+#   df_filtered, df_final = streaming.run_tuesday("year.csv", as_of)
+
+import numpy as np
+import pandas as pd
+
+import ingest
+import pipelines
+
+DEFAULT_CHUNKSIZE = 200_000
+
+# Per-chunk cleaning, matching what each pipeline does before its groupby
+PREPARE = {
+    'confcall': lambda df: pipelines.normalize_employees(pipelines.clean_confcall(df)),
+    'tuesdaycall': lambda df: pipelines.fill_tuesday(pipelines.normalize_employees(pipelines.clean_tuesday(df))),
+}
+
+AGGREGATIONS = {
+    'confcall': {col: 'sum' for col in pipelines.CONFCALL_NUMERIC},
+    'tuesdaycall': pipelines.TUESDAY_AGG,
+}
+
+
+def result_dtype(dtypes):
+    # What a groupby over the whole file would produce: rates parsed as float32
+    # stay float32 (any float chunk makes the column float), whole counts go to int64
+    floats = [dtype for dtype in dtypes if dtype.kind == 'f']
+    return max(floats, key=lambda dtype: dtype.itemsize) if floats else np.dtype('int64')
+
+
+def accumulate(partial, df, agg, keys=('Employee',)):
+    # partial: (sums, counts, dtypes seen per column), or None for the first chunk
+    # GP is summed as cents (whole numbers are exact in float64 up to 2**53)
+    values = pipelines.with_cents(df[list(agg)]).astype('float64')
+    grouped = values.groupby([df[key].astype(str) for key in keys])
+    sums, counts = grouped.sum(), grouped.size()
+    dtypes = {col: {df[col].dtype} for col in agg}
+    if partial is None:
+        return sums, counts, dtypes
+    old_sums, old_counts, old_dtypes = partial
+    return (
+        old_sums.add(sums, fill_value=0),
+        old_counts.add(counts, fill_value=0),
+        {col: old_dtypes[col] | dtypes[col] for col in agg},
+    )
+
+
+def finish(partial, agg, keys=('Employee',)):
+    # Back to the shape (and dtypes) of group_confcall / group_tuesday
+    if partial is None:  # header-only export
+        index = pd.MultiIndex.from_arrays([[]] * len(keys), names=list(keys))
+        partial = pd.DataFrame(columns=list(agg), index=index, dtype='float64'), pd.Series(index=index, dtype='float64'), {}
+    sums, counts, dtypes = partial
+    result = sums.copy()
+    for col, how in agg.items():
+        dtype = result_dtype(dtypes.get(col, {np.dtype('float64')}))
+        if how == 'mean':
+            result[col] = (sums[col] / counts).astype('float32' if dtype == 'float32' else 'float64')
+        else:
+            result[col] = sums[col].astype(dtype)
+    result = pipelines.from_cents(result).sort_index().reset_index()
+    for key in keys:
+        result[key] = result[key].astype('category')
+    return result
+
+
+def prepared_dtypes(report, first, seen):
+    # A derived column (FIOS/VHI = FWA + FIOS) promotes differently in a chunk
+    # where one input parsed as int, so cast a real row to the dtypes a
+    # whole-file parse would have had and run it through the same cleaning
+    # (a row, not an empty frame: empty reductions fall back to float64)
+    template = first.astype({
+        col: result_dtype(dtypes) for col, dtypes in seen.items() if all(d.kind in 'iuf' for d in dtypes)
+    })
+    prepared = PREPARE[report](template)
+    return {col: {prepared[col].dtype} for col in AGGREGATIONS[report]}
+
+
+def aggregate_reports(source, reports, chunksize=DEFAULT_CHUNKSIZE):
+    # One pass over the file feeds every requested report
+    partials = dict.fromkeys(reports)
+    first, seen = None, {}  # a sample row and the raw dtypes per column across chunks
+    for chunk in ingest.iter_export(source, reports, chunksize):
+        if first is None:
+            first = chunk.iloc[:1]
+        for col, dtype in chunk.dtypes.items():
+            seen.setdefault(col, set()).add(dtype)
+        for report in reports:
+            partials[report] = accumulate(partials[report], PREPARE[report](chunk), AGGREGATIONS[report])
+
+    for report, partial in partials.items():
+        if partial is not None:
+            partials[report] = partial[0], partial[1], prepared_dtypes(report, first, seen)
+    return {report: finish(partials[report], AGGREGATIONS[report]) for report in reports}
+
+
+def run_confcall(source, chunksize=DEFAULT_CHUNKSIZE):
+    summary = aggregate_reports(source, ['confcall'], chunksize)['confcall']
+    return pipelines.confcall_reports(pipelines.add_confcall_metrics(summary))
+
+
+def run_tuesday(source, as_of, method='calendar', curve=None, chunksize=DEFAULT_CHUNKSIZE):
+    df_grouped = aggregate_reports(source, ['tuesdaycall'], chunksize)['tuesdaycall']
+    return pipelines.tuesday_reports(df_grouped, as_of, method, curve)
@@ -0,0 +1,144 @@
+# ======================================================
+# 🧪 SYNTHETIC POWER BI EXPORTS
+# ======================================================
+# Generates KPI Details exports that look like the real thing: "$1,234.56"
+# and "55.3%" strings, blanks, Rep Enc / Unknown rows and the same person
+# spelled several ways. Every export carries both the confcall and the
+# tuesdaycall column sets unless asked otherwise. With --stores the export
+# looks like a district one: District / Location columns, each rep with a
+# home store and some rows at other stores.
+#
+#   python synth.py --rows 100000 -o exports/synthetic.csv
+#   python synth.py --rows 100000 --stores 12 -o exports/district.csv
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = ['Maria', 'Josue', 'Sam', 'Ann', 'Luis', 'Kayla', 'Omar', 'Priya', 'Derek', 'Tasha',
+               'Miguel', 'Grace', 'Andre', 'Lena', 'Victor', 'Nina', 'Caleb', 'Rosa', 'Ethan', 'Mei']
+LAST_NAMES = ['Lopez', 'Ordonez', 'Green', 'Bee', 'Rivera', 'Patel', 'Nguyen', 'Smith', 'Khan', 'Reyes',
+              'Brown', 'Diaz', 'Cole', 'Moreno', 'Ward', 'Silva', 'Young', 'Price', 'Lee', 'Ortiz']
+PLACEHOLDER_NAMES = ['Rep Enc', 'Unknown']
+STORES_PER_DISTRICT = 4
+
+
+def employee_names(count, rng):
+    # Distinct first/last pairs; past 400 people the last names get a numeric suffix
+    ids = rng.permutation(max(count, 1))[:count]
+    first = np.array(FIRST_NAMES)[ids % len(FIRST_NAMES)]
+    last = pd.Series(np.array(LAST_NAMES)[(ids // len(FIRST_NAMES)) % len(LAST_NAMES)])
+    block = ids // (len(FIRST_NAMES) * len(LAST_NAMES))
+    last = last.where(block == 0, last + block.astype(str))
+    return (pd.Series(first) + ' ' + last).to_numpy()
+
+
+def name_variants(names, rng):
+    # "First Last", "Last First", lower case and padded spellings of the same person
+    first_last = pd.Series(names)
+    parts = first_last.str.split(' ', n=1, expand=True)
+    last_first = parts[1] + ' ' + parts[0]
+    variant = rng.integers(0, 4, len(names))
+    out = first_last.where(variant != 1, last_first)
+    out = out.where(variant != 2, first_last.str.lower())
+    out = out.where(variant != 3, ' ' + first_last + ' ')
+    return out.to_numpy()
+
+
+def money(values):
+    return pd.Series(values).map('${:,.2f}'.format)
+
+
+# "0.0%" … "100.0%", indexed by tenths of a percent
+PERCENT_LABELS = np.array([f"{tenths / 10:.1f}%" for tenths in range(1001)], dtype=object)
+
+
+def percent(values):
+    return pd.Series(PERCENT_LABELS[np.rint(np.asarray(values) * 10).astype(int)])
+
+
+def store_labels(rows, picks, employees, stores, float_rate, rng):
+    # Reps mostly sell at their home store; float_rate of their rows are elsewhere
+    home = rng.integers(0, stores, employees)
+    store = home[picks]
+    floating = rng.random(rows) < float_rate
+    store[floating] = rng.integers(0, stores, floating.sum())
+    locations = np.array([f"Store {i + 1:03d}" for i in range(stores)], dtype=object)
+    districts = np.array([f"District {i // STORES_PER_DISTRICT + 1}" for i in range(stores)], dtype=object)
+    return districts[store], locations[store]
+
+
+def blank_out(series, rate, rng):
+    return series.mask(rng.random(len(series)) < rate)
+
+
+def generate_export(rows=1000, employees=25, report='both', nan_rate=0.02,
+                    placeholder_rate=0.03, seed=0, stores=0, float_rate=0.1):
+    rng = np.random.default_rng(seed)
+
+    names = employee_names(employees, rng)
+    picks = rng.integers(0, len(names), rows)
+    row_names = name_variants(names[picks], rng)
+    placeholders = rng.random(rows) < placeholder_rate
+    row_names[placeholders] = rng.choice(PLACEHOLDER_NAMES, placeholders.sum())
+
+    df = pd.DataFrame({
+        'Employee Full Name': row_names,
+        'GA': rng.poisson(2, rows),
+        'Upgrades': rng.poisson(4, rows),
+        'SMT GA': rng.poisson(1.5, rows),
+        'SMB GA': rng.poisson(0.3, rows),
+        'VZ Perks Rate': percent(rng.uniform(0, 100, rows)),
+        'VZ FWA GA': rng.poisson(0.2, rows),
+        'VZ FIOS GA': rng.poisson(0.1, rows),
+        'VMP Take Rate': percent(rng.uniform(0, 100, rows)),
+        'GP': money(rng.gamma(2.0, 900.0, rows)),
+        'SMT Qty': rng.poisson(2, rows),
+    })
+
+    if report in ('both', 'confcall'):
+        df['(RQ) Consumer SMT Prem Unlim %'] = percent(rng.uniform(0, 100, rows))
+    if report in ('both', 'tuesdaycall'):
+        df['VZ Premium %'] = percent(rng.uniform(0, 100, rows))
+        df['(CCRS) SMB Prem Unl %'] = percent(rng.uniform(0, 100, rows))
+        df['VZPH Qty'] = rng.poisson(0.2, rows)
+        df['VZ CC QTY'] = rng.poisson(0.1, rows)
+
+    for col in df.columns.drop('Employee Full Name'):
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype('Int64')
+        df[col] = blank_out(df[col], nan_rate, rng)
+
+    if stores:
+        districts, locations = store_labels(rows, picks, len(names), stores, float_rate, rng)
+        df.insert(0, 'District', districts)
+        df.insert(1, 'Location', locations)
+
+    return df
+
+
+def export_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Power BI KPI Details export.")
+    parser.add_argument('-o', '--output', default='synthetic_export.csv')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--employees', type=int, default=25)
+    parser.add_argument('--report', choices=['both', 'confcall', 'tuesdaycall'], default='both')
+    parser.add_argument('--nan-rate', type=float, default=0.02)
+    parser.add_argument('--stores', type=int, default=0,
+                        help="add District / Location columns spread over this many stores")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = generate_export(args.rows, args.employees, args.report, args.nan_rate, seed=args.seed,
+                         stores=args.stores)
+    df.to_csv(args.output, index=False)
+    print(f"✅ Wrote {len(df):,} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
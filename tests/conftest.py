@@ -0,0 +1,27 @@
+# The app is a folder of flat modules; make them importable from the tests.
+#
+#   python -m pytest tests
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import money  # after the path above
+
+
+@pytest.fixture
+def assert_same_table():
+    # For per-employee tables reached two ways (chunked vs in memory, cube vs
+    # groupby). Means may differ in the last float32 bit; money must not
+    # differ at all. The in-memory category index carries a name, which a
+    # rebuilt one doesn't; the values are what matter.
+    def check(result, expected):
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-6, check_categorical=False)
+        for col in money.MONEY_COLUMNS:
+            if col in expected.columns:
+                assert (result[col] == expected[col]).all(), col
+    return check
@@ -0,0 +1,130 @@
+# ======================================================
+# 💵 COMMISSION STATEMENTS TO THE CENT
+# ======================================================
+
+import random
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import commission
+import ingest
+
+
+def payroll(gp_cents, deduction_cents):
+    # The statement worked by hand in decimal dollars, each step rounded to the cent
+    cent = Decimal('0.01')
+    gp = Decimal(gp_cents) / 100
+    royalty = (gp * Decimal('0.18')).quantize(cent, ROUND_HALF_UP)
+    subtotal = ((gp - royalty) * Decimal('0.18')).quantize(cent, ROUND_HALF_UP)
+    earned = subtotal + 800 - Decimal(deduction_cents) / 100
+    return [int(value * 100) for value in (royalty, gp - royalty, subtotal, earned)]
+
+
+def test_breakdown_example():
+    # $12,345.67 GP, $125.50 deductions
+    parts = commission.breakdown(1_234_567, 12_550)
+    assert parts == {
+        'Royalty': 222_222,                # $2,222.22 (2,222.2206)
+        'GP After Royalty': 1_012_345,     # $10,123.45
+        'Commission Subtotal': 182_222,    # $1,822.22 (1,822.221)
+        'Bonus': 80_000,
+        'Commission Earned': 249_672,      # $2,496.72
+    }
+
+
+def test_breakdown_rounds_half_away_from_zero():
+    # 25¢ × 18% = 4.5¢ → 5¢; 20¢ × 18% = 3.6¢ → 4¢; a negative month mirrors it
+    assert commission.breakdown(25)['Royalty'] == 5
+    assert commission.breakdown(25)['Commission Subtotal'] == 4
+    assert commission.breakdown(-25)['Royalty'] == -5
+
+
+def test_breakdown_matches_decimal_payroll():
+    rng = random.Random(0)
+    gp = np.array([rng.randint(-500_000, 50_000_000) for _ in range(2000)] + [0, 1, 25, 10**12])
+    deductions = np.array([rng.randint(0, 200_000) for _ in range(len(gp))])
+    parts = commission.breakdown(gp, deductions)
+    columns = ['Royalty', 'GP After Royalty', 'Commission Subtotal', 'Commission Earned']
+    got = np.column_stack([parts[col] for col in columns]).tolist()
+    assert got == [payroll(int(g), int(d)) for g, d in zip(gp, deductions)]
+
+
+def test_employee_gp_sums_exactly():
+    df = pd.DataFrame({
+        'Employee Full Name': ["Maria Lopez"] * 10 + ["lopez maria", "Rep Enc", "Cher"],
+        'GP': [0.1] * 10 + [1234.56, 99.0, 99.0],
+    })
+    gp = commission.employee_gp(df)
+    assert gp.to_dict('records') == [{'Employee': "Lopez Maria", 'GP': 1235.56}]
+
+
+DEDUCTIONS_CSV = b"""Employee , Deductions,Reason
+josh ordonez,"$1,234.56",Phone
+Josue Ordonez,100,
+ Maria Lopez ,$0.10,Uniform
+Nobody Here,50,Typo
+"""
+
+
+def test_read_deductions_merges_spellings():
+    df = commission.read_deductions(DEDUCTIONS_CSV)
+    assert df.to_dict('records') == [
+        {'Employee': "Here Nobody", 'Deductions': 50.0, 'Reason': "Typo"},
+        {'Employee': "Josue Ordonez", 'Deductions': 1334.56, 'Reason': "Phone"},
+        {'Employee': "Lopez Maria", 'Deductions': 0.1, 'Reason': "Uniform"},
+    ]
+
+
+def test_read_deductions_requires_columns():
+    with pytest.raises(ingest.MissingColumnsError) as error:
+        commission.read_deductions(b"Employee,Amount\nMaria Lopez,5\n")
+    assert error.value.missing == ['Deductions']
+
+
+def test_statements_with_deductions_and_unknown_employee():
+    gp = pd.DataFrame({'Employee': ["Green Sam", "Josue Ordonez", "Lopez Maria"], 'GP': [0.0, 12345.67, 500.0]})
+    df, unmatched = commission.statements(gp, commission.read_deductions(DEDUCTIONS_CSV))
+
+    assert unmatched['Employee'].tolist() == ["Here Nobody"]
+    rows = df.set_index('Employee')
+    assert rows.loc["Green Sam", ['Deductions', 'Commission Earned', 'Deduction Reason']].tolist() == [0.0, 800.0, '']
+    assert rows.loc["Josue Ordonez", ['Royalty', 'Commission Subtotal', 'Commission Earned']].tolist() == \
+        [2222.22, 1822.22, 1287.66]           # 1,822.22 + 800 − 1,334.56
+    assert rows.loc["Lopez Maria", 'Commission Earned'] == 873.7  # 73.80 + 800 − 0.10
+    assert list(df.columns) == commission.STATEMENT_COLUMNS
+
+    # No deductions file at all
+    df, unmatched = commission.statements(gp)
+    assert unmatched.empty and (df['Commission Earned'] == [800.0, 2622.22, 873.8]).all()
+
+
+def test_statement_text_totals():
+    text = commission.statement_text(1_234_567, 12_550, "Phone", date(2025, 6, 13))
+    assert text.splitlines()[:10] == [
+        "Commission Earned: $2,496.72",
+        "",
+        "Calculation Breakdown:",
+        "1. GP Earned = $12,345.67",
+        "2. 18% Royalty Fee (deducted from GP) = $2,222.22",
+        "3. GP after royalty deduction = $10,123.45",
+        "4. Commission Subtotal = 18% of result above = $1,822.22",
+        "5. Add $800 bonus = $2,622.22",
+        "6. Subtract deductions ($125.50)",
+        "7. Final Commission Earned = $2,496.72",
+    ]
+    assert text.endswith("Due on second Friday of this month: June 13, 2025")
+
+
+@pytest.mark.parametrize('day, due', [
+    (date(2025, 6, 1), date(2025, 6, 13)),     # month starts on a Sunday
+    (date(2025, 6, 30), date(2025, 6, 13)),    # any day of the month
+    (date(2025, 8, 20), date(2025, 8, 8)),     # month starts on a Friday
+    (date(2025, 10, 2), date(2025, 10, 10)),   # ... on a Wednesday
+    (date(2026, 2, 1), date(2026, 2, 13)),
+])
+def test_second_friday(day, due):
+    assert commission.second_friday(day) == due
@@ -0,0 +1,54 @@
+# ======================================================
+# 🧊 CUBE ROLLUPS vs GROUPING THE ROWS
+# ======================================================
+# Every cube view is re-summed from the (District, Location, Employee)
+# cells; it must match grouping the cleaned rows directly.
+
+import pytest
+
+import cube
+import ingest
+import money
+import pipelines
+import synth
+
+CLEAN = {
+    'confcall': (pipelines.clean_confcall, pipelines.group_confcall),
+    'tuesdaycall': (pipelines.clean_tuesday, pipelines.group_tuesday),
+}
+
+
+@pytest.fixture(scope='module')
+def export():
+    return synth.export_bytes(synth.generate_export(4000, 30, seed=3, stores=8))
+
+
+def cleaned(export, report):
+    clean, _ = CLEAN[report]
+    return pipelines.normalize_employees(clean(ingest.parse_export(export, report)))
+
+
+@pytest.mark.parametrize('report', list(CLEAN))
+def test_employee_rollup_matches_group(export, report, assert_same_table):
+    df = cleaned(export, report)
+    group = CLEAN[report][1]
+    assert_same_table(cube.rollup(cube.build(df, report), 'Employee'), group(df))
+
+
+@pytest.mark.parametrize('report', list(CLEAN))
+def test_store_view_matches_its_rows(export, report, assert_same_table):
+    df = cleaned(export, report)
+    store_cube = cube.build(df, report)
+    store = cube.members(store_cube, 'Location')[0]
+    rows = df[df['Location'].astype(str) == store]
+    rows = rows.assign(Employee=rows['Employee'].astype(str).astype('category'))
+    expected = CLEAN[report][1](rows)
+    assert_same_table(cube.rollup(store_cube, 'Employee', {'Location': store}), expected)
+
+
+def test_district_totals_add_up(export):
+    df = cleaned(export, 'tuesdaycall')
+    store_cube = cube.build(df, 'tuesdaycall')
+    districts = cube.rollup(store_cube, 'District')
+    assert money.total(districts['GP']) == money.total(pipelines.group_tuesday(df)['GP'])
+    assert districts['SMT Qty'].sum() == df['SMT Qty'].sum()
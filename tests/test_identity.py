@@ -0,0 +1,87 @@
+# ======================================================
+# 🪪 NAME CANONICALIZATION, ALIASES AND EXCLUSIONS
+# ======================================================
+
+import json
+
+import pandas as pd
+import pytest
+
+import identity
+import pipelines
+
+
+@pytest.fixture
+def aliases_path(tmp_path):
+    path = tmp_path / 'aliases.json'
+    path.write_text(json.dumps({"Josh Ordonez": "Josue Ordonez"}))
+    return str(path)
+
+
+@pytest.mark.parametrize('spelling', ["Maria Lopez", "lopez maria", "  MARIA   LOPEZ ", "Lopez\tMaria", "maria Lopez"])
+def test_case_whitespace_and_order_collapse(spelling):
+    assert identity.canonical_name(spelling) == "Lopez Maria"
+
+
+def test_tokens_sort_case_insensitively():
+    # The original case-sensitive sort put capitalized tokens first ("Bell Ana")
+    assert identity.canonical_name("ana Bell") == identity.canonical_name("Ana Bell") == "Ana Bell"
+
+
+def test_aliases_file_is_canonicalized(aliases_path):
+    assert identity.load_aliases(aliases_path) == {"Josh Ordonez": "Josue Ordonez"}
+    assert identity.load_aliases(aliases_path + '.missing') == {}
+
+
+def test_repo_alias_table_merges_ordonez():
+    assert identity.canonical("ordonez josh") == "Josue Ordonez"
+
+
+@pytest.mark.parametrize('categorical', [False, True], ids=['strings', 'categorical'])
+def test_resolve_merges_aliases_and_drops_non_people(aliases_path, categorical):
+    names = pd.Series(["Josh Ordonez", "ordonez josue", " Josue  Ordonez", "Rep Enc", "enc  REP",
+                       "Cher", "", None, "Maria Lopez", "lopez maria"])
+    if categorical:
+        names = names.astype('category')
+    ids, employees = identity.resolve(names, identity.load_aliases(aliases_path))
+
+    assert employees.tolist() == ["Josue Ordonez", "Lopez Maria"]
+    assert ids.tolist() == [0, 0, 0, -1, -1, -1, -1, -1, 1, 1]
+    assert identity.lookup("Josh Ordonez", employees, identity.load_aliases(aliases_path)) == 0
+    assert identity.lookup("Sam Green", employees, {}) is None
+
+
+def test_add_alias_points_at_the_final_name(aliases_path):
+    # "Jo Ordonez" → "Josh Ordonez" → "Josue Ordonez" is stored as one step
+    aliases = identity.add_alias("jo ordonez", "Josh Ordonez", aliases_path)
+    assert aliases["Jo Ordonez"] == "Josue Ordonez"
+
+    # Re-pointing a target moves the aliases that led to it
+    aliases = identity.add_alias("Josue Ordonez", "Josue A Ordonez", aliases_path)
+    assert set(aliases.values()) == {"A Josue Ordonez"}
+    assert identity.load_aliases(aliases_path) == aliases
+
+
+@pytest.mark.parametrize('alias, target', [("Cher", "Maria Lopez"), ("Rep Enc", "Maria Lopez"),
+                                           ("Josue Ordonez", "josh ordonez")])
+def test_add_alias_rejects(aliases_path, alias, target):
+    with pytest.raises(ValueError):
+        identity.add_alias(alias, target, aliases_path)
+
+
+def test_remove_alias(aliases_path):
+    assert identity.remove_alias("ordonez josh", aliases_path) == {}
+    with pytest.raises(KeyError):
+        identity.remove_alias("Josh Ordonez", aliases_path)
+
+
+def test_excluded_after_canonicalization():
+    # Every spelling of an excluded rep, aliases included, leaves the scorecard
+    df = pd.DataFrame({
+        'Employee': ["josh ordonez", "Ordonez Josue", "WIGUEN thimotee", "Thimotee Wiguen", "Maria Lopez", "Rep Enc"],
+        'GP': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+    df = pipelines.normalize_employees(df)
+    assert df['Employee'].astype(str).tolist() == ["Josue Ordonez", "Josue Ordonez", "Thimotee Wiguen",
+                                                   "Thimotee Wiguen", "Lopez Maria"]
+    assert df.loc[~pipelines.confcall_excluded(df), 'Employee'].astype(str).tolist() == ["Lopez Maria"]
@@ -0,0 +1,126 @@
+# ======================================================
+# 🏆 ROLLING WINDOWS vs A BRUTE-FORCE RECOMPUTE
+# ======================================================
+# leaderboard.py keeps its 7/30/90-day windows up to date incrementally;
+# after every kind of save (next day, re-export, backfill) they must equal
+# recomputing each window from the saved month-to-date snapshots.
+
+import random
+from contextlib import closing
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import history
+import leaderboard
+
+PAGE = 'confcall'
+START = date(2025, 1, 1)
+
+
+def month_to_date(rng, days, employees=15):
+    # {day: the export saved for that day}, MTD numbers that restart each month
+    totals, frames = {}, {}
+    for day in days:
+        rows = []
+        for employee in (f"Rep {i}" for i in range(employees)):
+            if rng.random() < 0.1:
+                continue
+            period = (day.strftime('%Y-%m'), employee)
+            gp, smart = totals.get(period, (0.0, 0))
+            gp, smart = round(gp + rng.uniform(-50, 900), 2), smart + rng.randint(0, 4)
+            totals[period] = gp, smart
+            rows.append({'Employee': employee, 'GP': gp, 'SMT QTY': smart, 'Points': round(rng.uniform(0, 4), 2)})
+        frames[day] = pd.DataFrame(rows)
+    return frames
+
+
+def brute_force(saved, as_of, days):
+    # Each snapshot's increment over the previous one in its month, summed
+    # over (as_of - days, as_of]; Points is the mean of the daily values
+    increments, previous = [], {}
+    for day in sorted(saved):
+        current = saved[day].set_index('Employee')
+        before = previous.get(day.strftime('%Y-%m'))
+        step = current[['GP', 'SMT QTY']]
+        if before is not None:
+            step = step - before[['GP', 'SMT QTY']].reindex(current.index).fillna(0)
+        increments.append(step.assign(Points=current['Points'], day=day))
+        previous[day.strftime('%Y-%m')] = current
+    window = pd.concat(increments)
+    window = window[(window['day'] > as_of - timedelta(days=days)) & (window['day'] <= as_of)]
+    totals = window.groupby(level=0).agg(GP=('GP', 'sum'), smart=('SMT QTY', 'sum'), Points=('Points', 'mean'))
+    totals['GP Per Smart'] = (totals['GP'] / totals['smart'].where(totals['smart'] > 0)).fillna(0)
+    return totals
+
+
+def check(path, saved):
+    as_of = max(saved)
+    with closing(leaderboard.reader(path)) as conn:
+        for days in leaderboard.WINDOWS:
+            expected = brute_force(saved, as_of, days)
+            values = leaderboard.metric_values(leaderboard.read_windows(conn, PAGE, days)).reindex(expected.index)
+            for metric in leaderboard.METRICS:
+                assert np.allclose(values[metric], expected[metric], atol=0.005), (days, metric)
+
+
+def save(path, saved, frame, day, upload_hash):
+    history.save_snapshot(frame, PAGE, upload_hash, day, path)
+    leaderboard.update(PAGE, path)
+    saved[day] = frame
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / 'history.sqlite3')
+
+
+def test_windows_match_brute_force(db):
+    rng = random.Random(1)
+    days = [START + timedelta(days=i) for i in range(120) if rng.random() < 0.8]
+    frames = month_to_date(rng, days)
+
+    saved = {}
+    for i, day in enumerate(days):
+        save(db, saved, frames[day], day, f"h{day}")
+        if i % 20 == 0:
+            check(db, saved)
+    check(db, saved)
+
+    # A re-export of the latest day replaces its snapshot
+    last = days[-1]
+    save(db, saved, frames[last].assign(GP=frames[last]['GP'] + 100), last, 're-export')
+    check(db, saved)
+
+    # A backfilled day inside the windows changes the next day's increment too
+    missing = next(day for day in (START + timedelta(days=i) for i in range(100, 120)) if day not in frames)
+    before = max(day for day in days if day < missing)
+    save(db, saved, frames[before].assign(GP=frames[before]['GP'] + 5), missing, 'backfill')
+    check(db, saved)
+
+
+def test_ranks_follow_the_windows(db):
+    rng = random.Random(2)
+    days = [START + timedelta(days=i) for i in range(10)]
+    saved = {}
+    for day, frame in month_to_date(rng, days).items():
+        save(db, saved, frame, day, f"h{day}")
+
+    table = leaderboard.leaderboard(PAGE, 30, 'GP', k=5, path=db)
+    expected = brute_force(saved, days[-1], 30)['GP'].sort_values(ascending=False)
+    assert table['Employee'].tolist() == expected.index[:5].tolist()
+    assert table['Rank'].tolist() == [1, 2, 3, 4, 5]
+    assert (table['Change'] == table['Previous Rank'] - table['Rank']).all()
+
+
+def test_top_k():
+    values = np.array([3.0, 9.0, 1.0, 9.0, 5.0])
+    assert leaderboard.top_k(values, 3).tolist() == [1, 3, 4]
+    assert leaderboard.top_k(values, 10).tolist() == [1, 3, 4, 0, 2]
+    assert leaderboard.top_k(values[:0], 3).tolist() == []
+
+
+def test_no_history_is_an_empty_board(db):
+    assert leaderboard.leaderboard(PAGE, 7, 'GP', path=db).empty
@@ -0,0 +1,85 @@
+# ======================================================
+# 💲 MONEY PARSING AND ROUNDING
+# ======================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+import money
+
+# Export spellings → cents
+SPELLINGS = {
+    '$1,234.56': 123456,
+    ' 1,000.00 ': 100000,
+    '-$5.10': -510,
+    '(12.50)': -1250,
+    '($1,234.56)': -123456,
+    '12': 1200,
+    '.5': 50,
+    '1.005': 101,       # a third decimal rounds half up
+    '12.345': 1235,
+    '1.004': 100,
+    '-0.005': -1,
+    '': 0,
+    '   ': 0,
+    '$': 0,
+    'n/a': 0,
+    None: 0,
+}
+
+
+def test_parse_cents_spellings():
+    assert money.parse_cents(list(SPELLINGS)).tolist() == list(SPELLINGS.values())
+
+
+def test_parse_cents_categorical_matches_plain():
+    values = pd.Series(list(SPELLINGS) * 3)
+    parsed = ingest.parse_distinct(values.astype('category'), money.parse_cents, 0)
+    assert parsed.tolist() == money.parse_cents(values).tolist()
+
+
+def test_parse_cents_numbers():
+    assert money.parse_cents(pd.Series([12.5, -3.25, np.nan, 0.1])).tolist() == [1250, -325, 0, 10]
+
+
+def test_parse_cents_two_decimals_are_exact():
+    # The float fast path must give the same cents as the digit-by-digit one
+    cents = np.random.default_rng(0).integers(-10**12, 10**12, 20_000)
+    text = [f"{'-' if c < 0 else ''}{abs(c) // 100}.{abs(c) % 100:02d}" for c in cents]
+    assert (money.parse_cents(text) == cents).all()
+
+
+def test_sum_is_exact():
+    # sum() of ten 0.1s is 0.9999999999999999
+    assert money.total([0.1] * 10) == 1.0
+
+
+@pytest.mark.parametrize('text, cents', [('1234.5', 123450), ('$1,234.50', 123450), ('(3)', -300), ('0', 0)])
+def test_parse_amount(text, cents):
+    assert money.parse_amount(text) == cents
+
+
+@pytest.mark.parametrize('text', ['', 'abc', '.', '$', '12.3.4'])
+def test_parse_amount_rejects_junk(text):
+    with pytest.raises(ValueError):
+        money.parse_amount(text)
+
+
+def test_apply_rate_rounds_half_away_from_zero():
+    # 25¢ × 18% = 4.5¢
+    assert money.apply_rate([25, -25, 24, -24, 0], 1800).tolist() == [5, -5, 4, -4, 0]
+    # Large totals stay exact (a float product would drift)
+    assert money.apply_rate(10**13 + 1, 1800) == 18 * 10**11
+
+
+def test_divide_rounds_half_away_from_zero():
+    assert money.divide([1, -1, 3], 0.5).tolist() == [2, -2, 6]
+    assert money.divide([5, -5], 2.0).tolist() == [3, -3]
+
+
+def test_format_cents():
+    assert money.format_cents(-123456) == '-$1,234.56'
+    assert money.format_cents(5) == '$0.05'
+    assert money.format_cents(10**9) == '$10,000,000.00'
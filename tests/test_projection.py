@@ -0,0 +1,102 @@
+# ======================================================
+# 🔮 MONTH-END PROJECTIONS
+# ======================================================
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import projection
+
+
+def test_store_holidays():
+    assert projection.store_holidays(2025) == (date(2025, 1, 1), date(2025, 11, 27), date(2025, 12, 25))
+    assert projection.store_holidays(2024)[1] == date(2024, 11, 28)
+
+
+@pytest.mark.parametrize('as_of, projected', [
+    (date(2025, 6, 1), 3000.0),      # first day: 1 of 30
+    (date(2025, 6, 15), 200.0),
+    (date(2025, 6, 30), 100.0),      # last day: the value itself
+    (date(2024, 2, 1), 2900.0),      # leap February
+])
+def test_calendar(as_of, projected):
+    assert projection.project([100.0], as_of, 'calendar')[0] == projected
+
+
+def test_calendar_rounds_to_the_cent():
+    # $100.01 after 3 of 31 days → $1,033.436… → $1,033.44
+    assert projection.project([100.01], date(2025, 7, 3))[0] == 1033.44
+
+
+@pytest.mark.parametrize('as_of, share', [
+    (date(2025, 12, 24), 24 / 30),   # Christmas closed: 30 open days
+    (date(2025, 12, 25), 24 / 30),   # a closed day adds nothing
+    (date(2025, 12, 31), 1.0),
+    (date(2025, 11, 27), 26 / 29),   # Thanksgiving
+    (date(2025, 6, 1), 1 / 30),      # no holiday: same as calendar days
+])
+def test_business_share_skips_holidays(as_of, share):
+    assert projection.business_share(as_of) == pytest.approx(share)
+
+
+def test_business_closed_first_day_keeps_the_value():
+    # Nothing booked on New Year's Day: no pace to project from
+    assert projection.elapsed_share(date(2026, 1, 1), 'business') == 0
+    assert projection.project([250.0], date(2026, 1, 1), 'business')[0] == 250.0
+    assert projection.project([250.0], date(2026, 1, 2), 'business')[0] == 250.0 * 30
+
+
+def test_business_weekmask():
+    # June 2025 has 21 weekdays; June 2–6 are the first five
+    assert projection.business_share(date(2025, 6, 7), weekmask='1111100') == pytest.approx(5 / 21)
+
+
+def test_dates_per_value():
+    as_of = np.array(['2025-06-01', '2025-06-30', '2025-12-25'], dtype='datetime64[D]')
+    assert projection.project([100.0] * 3, as_of, 'business').tolist() == [3000.0, 100.0, 125.0]
+
+
+def month_totals(period, days, value):
+    # One snapshot per listed day; value(day) is the team's month-to-date total
+    year, month = map(int, period.split('-'))
+    return pd.DataFrame({
+        'period': period,
+        'as_of': [date(year, month, day).isoformat() for day in days],
+        'value': [value(day) for day in days],
+    })
+
+
+def test_curve_learned_from_a_shorter_month():
+    # February books evenly; the curve is a fraction of the month, so on a
+    # 31-day March it projects exactly like calendar days
+    curve = projection.daily_curve(month_totals('2025-02', range(1, 29), lambda day: day * 10.0))
+    march = [date(2025, 3, day) for day in (1, 10, 16, 31)]
+    for as_of in march:
+        assert projection.project([1234.56], as_of, 'curve', curve)[0] == \
+            pytest.approx(projection.project([1234.56], as_of, 'calendar')[0], abs=0.011)
+
+
+def test_curve_back_loaded_month():
+    # Half of April books a quarter of the month, so mid-month is about 4×
+    # (the curve is kept at CURVE_POINTS resolution, which rounds the kink)
+    curve = projection.daily_curve(month_totals('2025-04', [15, 30], lambda day: 25.0 if day == 15 else 100.0))
+    assert projection.project([250.0], date(2025, 4, 15), 'curve', curve)[0] == pytest.approx(1000.0, rel=0.05)
+    assert projection.project([250.0], date(2025, 4, 30), 'curve', curve)[0] == 250.0
+
+
+def test_curve_skips_incomplete_months():
+    # A month without a last-day snapshot can't say how the month ended
+    assert projection.daily_curve(month_totals('2025-06', [10, 20, 29], float)) is None
+    totals = pd.concat([month_totals('2025-06', [10, 20, 29], float), month_totals('2025-07', [31], float)])
+    grid, booked = projection.daily_curve(totals)
+    assert booked[-1] == 1.0 and booked[0] == 0.0
+
+
+def test_curve_method_needs_a_curve():
+    with pytest.raises(ValueError):
+        projection.project([1.0], date(2025, 6, 1), 'curve')
+    with pytest.raises(ValueError):
+        projection.project([1.0], date(2025, 6, 1), 'weekly')
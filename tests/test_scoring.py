@@ -0,0 +1,92 @@
+# ======================================================
+# 🧮 TIER TABLES vs THE ORIGINAL PER-ROW RULES
+# ======================================================
+# scoring.SCORE_TIERS replaced one if/else chain per metric; these are
+# those chains, kept as the reference the tables must reproduce.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+import pipelines
+import scoring
+import synth
+
+ORIGINAL_RULES = {
+    'Score SMT': ('SMT GA', lambda x: 4 if x >= 30 else 3 if x >= 25 else 2 if x >= 20 else 1),
+    'Score Upgrades': ('Upgrades', lambda x: 4 if x >= 65 else 3 if x >= 55 else 2 if x >= 45 else 1),
+    'Score Perks': ('VZ Perks Rate (%)', lambda x: 4 if x >= 55 else 3 if x >= 40 else 2 if x >= 25 else 1),
+    'Score VMP': ('VMP', lambda x: 4 if x >= 75 else 3 if x >= 65 else 2 if x >= 55 else 1),
+    'Score SMB': ('SMB GA', lambda x: 4 if x >= 7 else 3 if x >= 5 else 2 if x >= 3 else 1),
+    'Score Unlimited': ('Premium Unlim (%)', lambda x: 4 if x >= 65 else 3 if x >= 60 else 2 if x >= 55 else 1),
+    'Score VHI/FIOS': ('FIOS/VHI', lambda x: 4 if x >= 7 else 3 if x >= 5 else 2 if x >= 3 else 1),
+    'Score GP': ('GP', lambda x: 4 if x >= 40001 else 3 if x >= 30000 else 2 if x >= 18201 else 1),
+}
+
+
+def original_rate(points):
+    return 30 if points >= 3.5 else 25 if points >= 2.5 else 20 if points >= 1.5 else 18
+
+
+def original_scores(df):
+    # The baseline page: percents given as fractions were scaled first
+    df = df.copy()
+    for col in scoring.PERCENT_METRICS:
+        df[col] = df[col].apply(lambda x: x * 100 if x < 1 else x)
+    scores = pd.DataFrame({score: df[metric].apply(rule) for score, (metric, rule) in ORIGINAL_RULES.items()})
+    scores['Points'] = scores.mean(axis=1).round(2)
+    scores['Commission %'] = scores['Points'].apply(original_rate)
+    scores['Commission Earned'] = df['GP'] * scores['Commission %'] / 100
+    return scores
+
+
+def assert_same_scores(df):
+    scored, expected = scoring.score_frame(df), original_scores(df)
+    for col in [*ORIGINAL_RULES, 'Points', 'Commission %']:
+        assert (scored[col].to_numpy() == expected[col].to_numpy()).all(), col
+    assert np.allclose(scored['Commission Earned'], expected['Commission Earned'], atol=0.005)
+
+
+def boundary_rows():
+    # Every metric exactly on, just below and just above each threshold,
+    # one metric varied per row with the others held at 0
+    base = {metric: 0.0 for metric, _ in ORIGINAL_RULES.values()}
+    rows = []
+    for tier in scoring.SCORE_TIERS.values():
+        for threshold in tier['thresholds']:
+            for value in (threshold - 0.01, threshold, threshold + 0.01):
+                rows.append({**base, tier['metric']: value})
+    return pd.DataFrame(rows)
+
+
+def test_thresholds_match_original_rules():
+    assert_same_scores(boundary_rows())
+
+
+def test_rules_on_synthetic_exports():
+    # Reps with a handful of rows up to hundreds, so every tier is reached
+    frames = []
+    for rows, employees in [(400, 200), (1500, 300), (3000, 300), (6000, 300), (3000, 40)]:
+        data = synth.export_bytes(synth.generate_export(rows, employees, seed=5))
+        frames.append(pipelines.aggregate_confcall(pipelines.normalize_employees(
+            pipelines.clean_confcall(ingest.parse_export(data, 'confcall')))))
+    df = pd.concat(frames, ignore_index=True)
+    assert_same_scores(df)
+    assert scoring.score_frame(df)[list(ORIGINAL_RULES)].nunique().eq(4).all()
+
+
+def test_fraction_rates_are_scaled():
+    df = boundary_rows().head(1).assign(**{'VZ Perks Rate (%)': 0.55, 'VMP': 0.75, 'Premium Unlim (%)': 0.65})
+    scored = scoring.score_frame(df)
+    assert scored[['Score Perks', 'Score VMP', 'Score Unlimited']].iloc[0].tolist() == [4, 4, 4]
+
+
+def test_missing_values_score_one():
+    df = boundary_rows().head(1).assign(GP=np.nan)
+    assert scoring.score_frame(df)['Score GP'].iloc[0] == 1
+
+
+@pytest.mark.parametrize('points, rate', [(1.49, 18), (1.5, 20), (2.49, 20), (2.5, 25), (3.49, 25), (3.5, 30), (4, 30)])
+def test_commission_rate_boundaries(points, rate):
+    assert scoring.commission_rate([points])[0] == rate == original_rate(points)
@@ -0,0 +1,82 @@
+# ======================================================
+# 🧪 WHAT-IF SCENARIOS vs THE SCORECARD
+# ======================================================
+# The simulator re-implements scoring.score_frame with broadcasting; the
+# "Current" scenario must be the scorecard, and a moved threshold must
+# only touch the reps whose numbers sit between the old and new value.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+import money
+import pipelines
+import scoring
+import simulator
+import synth
+
+
+@pytest.fixture(scope='module')
+def employees():
+    # Reps with a handful of rows up to hundreds, so every tier is reached
+    frames = []
+    for rows, count in [(400, 200), (1500, 300), (3000, 300), (6000, 300)]:
+        data = synth.export_bytes(synth.generate_export(rows, count, seed=11))
+        frames.append(pipelines.aggregate_confcall(pipelines.normalize_employees(
+            pipelines.clean_confcall(ingest.parse_export(data, 'confcall')))))
+    return pd.concat(frames, ignore_index=True)
+
+
+def assert_matches_scorecard(result, index, df, config):
+    scored = scoring.score_frame(df, config['tiers'], config['commission_tiers'])
+    assert (result['points'][index] == scored['Points'].to_numpy()).all()
+    assert (result['rates'][index] == scored['Commission %'].to_numpy()).all()
+    assert (result['payouts'][index] == money.to_cents(scored['Commission Earned'])).all()
+
+
+def test_current_is_the_scorecard(employees):
+    result = simulator.simulate(employees, [simulator.scenario("Current")])
+    assert_matches_scorecard(result, 0, employees, simulator.scenario("Current"))
+    assert len(np.unique(result['rates'][0])) == 4
+
+
+def test_every_swept_scenario_is_a_scorecard(employees):
+    scenarios = ([simulator.scenario("Current")] + simulator.sweep('Score GP', 1, range(25_000, 35_001, 2_500))
+                 + simulator.rate_sweep(2, [3.25, 3.5, 3.75]))
+    result = simulator.simulate(employees, scenarios)
+    for index, config in enumerate(scenarios):
+        assert_matches_scorecard(result, index, employees, config)
+
+
+def test_moved_threshold_changes_only_the_reps_in_between(employees):
+    # Score SMT's first tier 20 → 22: exactly the reps with 20 ≤ SMT GA < 22 lose a point
+    result = simulator.simulate(employees, [simulator.scenario("Current")] + simulator.sweep('Score SMT', 0, [22]))
+    smt = employees['SMT GA'].to_numpy()
+    affected = (smt >= 20) & (smt < 22)
+    assert affected.any()
+
+    changed = result['points'][1] != result['points'][0]
+    assert (changed == affected).all()
+    drop = result['points'][0][affected] - result['points'][1][affected]
+    assert np.allclose(drop, 1 / len(scoring.SCORE_TIERS), atol=0.011)
+
+
+def test_moved_rate_threshold_changes_only_the_reps_in_between(employees):
+    # 25% needs 2.75 points instead of 2.5: reps on 2.5–2.74 drop to 20%
+    result = simulator.simulate(employees, [simulator.scenario("Current")] + simulator.rate_sweep(1, [2.75]))
+    points = result['points'][0]
+    affected = (points >= 2.5) & (points < 2.75)
+    assert affected.any()
+
+    assert ((result['rates'][1] != result['rates'][0]) == affected).all()
+    assert (result['rates'][1][affected] == 20).all()
+    gp = money.to_cents(employees['GP'])
+    moved = affected & (gp != 0)
+    assert ((result['payouts'][1] != result['payouts'][0]) == moved).all()
+
+    table = simulator.summary(result)
+    assert table.loc[1, 'Reps Changed'] == moved.sum()
+    assert table.loc[1, 'Change'] == money.to_dollars(result['payouts'][1].sum() - result['payouts'][0].sum())
+    deltas = simulator.rep_deltas(result, 1)
+    assert (deltas['Change'] != 0).sum() == moved.sum()
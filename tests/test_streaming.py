@@ -0,0 +1,36 @@
+# ======================================================
+# 🌊 STREAMING vs IN-MEMORY AGGREGATION
+# ======================================================
+# The chunked path (streaming.py) must give the same per-employee frames as
+# one groupby over the whole file, however the rows fall into chunks.
+
+import pytest
+
+import batch
+import pipelines
+import streaming
+import synth
+
+REPORTS = ['confcall', 'tuesdaycall']
+
+
+@pytest.fixture(scope='module', params=[0, 6], ids=['single-store', 'district'])
+def export(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp('exports') / 'export.csv'
+    synth.generate_export(5000, 30, seed=7, stores=request.param).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('chunksize', [997, 1_000_000])
+def test_streaming_matches_in_memory(export, chunksize, assert_same_table):
+    in_memory = batch.group_in_memory(export.read_bytes(), REPORTS)
+    streamed = streaming.aggregate_reports(export, REPORTS, chunksize)
+    for report in REPORTS:
+        assert_same_table(streamed[report], in_memory[report])
+
+
+def test_streaming_reports_match_in_memory(export, assert_same_table):
+    in_memory = batch.group_in_memory(export.read_bytes(), ['confcall'])['confcall']
+    expected = pipelines.confcall_reports(pipelines.add_confcall_metrics(in_memory))
+    for streamed, table in zip(streaming.run_confcall(export, chunksize=997), expected):
+        assert_same_table(streamed, table)
@@ -2,17 +2,23 @@
 # 🔧 Imports and Setup
 # ========================== #
 import streamlit as st
-import pandas as pd
-import numpy as np
-import os
 from datetime import datetime
-from calendar import monthrange
 
-# Safe upload directory
-upload_dir = "/tmp/uploaded_files"
-os.makedirs(upload_dir, exist_ok=True)
+import auth
+import cube
+import display
+import history
+import jobs
+import ingest
+import leaderboard
+import money
+import pipelines
+import profiling
+import projection
+import upload_store
 
 st.set_page_config(page_title="Current Sales Performance", layout="wide")
+auth.require_login()
 
 # ========================== #
 # 📋 App Title and Instructions
@@ -34,182 +40,88 @@ st.markdown("""
 # ========================== #
 # 📄 File Upload
 # ========================== #
-uploaded_file = st.file_uploader("📂 Upload your sales CSV file", type=["csv"])
+# Shared with the other pages: an export uploaded there shows up here too
+upload = upload_store.shared_upload("📂 Upload your sales CSV file")
+
+profiler = profiling.StageProfiler("tuesdaycall")
 
 # ========================== #
 # 🔄 Process File
 # ========================== #
-if uploaded_file is not None:
+if upload is not None:
+    source, digest = upload
     try:
-        # Save uploaded file
-        file_path = os.path.join(upload_dir, uploaded_file.name)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-
-        df = pd.read_csv(file_path)
-        df.columns = [col.strip() for col in df.columns]
-
-        # ✅ Combine VZ Premium % and CCRS SMB Prem Unl % into one column
-        def parse_percent(val):
-            try:
-                return float(str(val).strip('%'))
-            except:
-                return np.nan
-
-        if 'VZ Premium %' in df.columns and '(CCRS) SMB Prem Unl %' in df.columns:
-            df['VZ Premium %'] = df['VZ Premium %'].apply(parse_percent)
-            df['(CCRS) SMB Prem Unl %'] = df['(CCRS) SMB Prem Unl %'].apply(parse_percent)
-            df['Premium Unlimited'] = df[['VZ Premium %', '(CCRS) SMB Prem Unl %']].mean(axis=1)
-        else:
-            st.error("❌ Required columns 'VZ Premium %' and/or '(CCRS) SMB Prem Unl %' are missing.")
+        # Check the header before any parsing; point wrong exports to their page
+        upload_store.require_page(source, 'tuesdaycall')
+
+        # Parse → clean → group on a background worker, with progress and a cancel button.
+        # Multi-store exports are grouped into a store × employee cube instead.
+        locations = cube.has_locations(source)
+        job_key = ('tuesdaycall', digest)
+        job = jobs.submit(job_key, [
+            ("parse", lambda source: ingest.parse_export(source, 'tuesdaycall')),
+            ("clean", lambda df: pipelines.normalize_employees(pipelines.clean_tuesday(df))),
+            ("cube", lambda df: cube.build(df, 'tuesdaycall')) if locations else ("groupby", pipelines.group_tuesday),
+        ], source)
+
+        if not job.finished:
+            jobs.show_progress(job, jobs.show_cleaned)
             st.stop()
-
-        # ✅ Rename columns (excluding Premium Unlimited, already handled)
-        df.rename(columns={
-            'Employee Full Name': 'Employee',
-            'GA': 'News',
-            'VZ Perks Rate': 'Perks',
-            'VMP Take Rate': 'VMP',
-            'VZPH Qty': 'VZPH',
-            'VZ CC QTY': 'Verizon Visa'
-        }, inplace=True)
-
-        # Clean employee names
-        df = df[df['Employee'].astype(str).str.split().str.len() >= 2]
-        df = df[~df['Employee'].str.lower().isin(['rep enc', 'unknown'])]
-        df['Employee'] = df['Employee'].apply(lambda name: " ".join(sorted(name.strip().split())).title())
-
-        # Clean numeric columns
-        numeric_cols = ['Perks', 'VMP', 'Premium Unlimited', 'GP', 'News', 'Upgrades',
-                        'SMT GA', 'SMB GA', 'SMT Qty', 'VZ FWA GA', 'VZ FIOS GA',
-                        'VZPH', 'Verizon Visa']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col].astype(str)
-                                    .str.replace('%', '', regex=False)
-                                    .str.replace('$', '', regex=False)
-                                    .str.replace(',', '', regex=False), errors='coerce')
-
-        df.fillna(0, inplace=True)
-
-        # Group data
-        df_grouped = df.groupby('Employee', as_index=False).agg({
-            'News': 'sum', 'Upgrades': 'sum', 'SMT GA': 'sum', 'Perks': 'mean', 'VMP': 'mean',
-            'GP': 'sum', 'SMB GA': 'sum', 'Premium Unlimited': 'mean', 'VZ FWA GA': 'sum',
-            'VZ FIOS GA': 'sum', 'VZPH': 'sum', 'Verizon Visa': 'sum', 'SMT Qty': 'sum'
-        })
-
-        # Derived metrics
-        df_grouped['Ratio'] = np.where(df_grouped['Upgrades'] != 0, df_grouped['News'] / df_grouped['Upgrades'] * 100, 0)
-        df_grouped['GP Per Smart'] = np.where(df_grouped['SMT Qty'] != 0, df_grouped['GP'] / df_grouped['SMT Qty'], 0)
-        df_grouped['VHI/FIOS'] = df_grouped['VZ FWA GA'] + df_grouped['VZ FIOS GA']
-
-        # Projection logic
-        today = datetime.today()
-        start_of_month = today.replace(day=1)
-        days_elapsed = (today - start_of_month).days + 1
-        days_in_month = monthrange(today.year, today.month)[1]
-
-        df_grouped['Projected GP'] = df_grouped['GP'].apply(
-            lambda x: round((x / days_elapsed) * days_in_month, 2)
-        )
-
-        # Filter out employees with all zeros
-        df_filtered = df_grouped[(df_grouped.drop(columns='Employee') != 0).any(axis=1)]
-
-        # Add TOTAL row
-        average_cols = ['Ratio', 'Perks', 'VMP', 'Premium Unlimited', 'GP Per Smart']
-        summary_data = df_filtered.drop(columns='Employee').sum(numeric_only=True)
-
-        for col in average_cols:
-            if col in df_filtered.columns:
-                summary_data[col] = df_filtered[col].mean()
-
-        summary_data['Projected GP'] = df_filtered['Projected GP'].sum()
-
-        summary_row = pd.DataFrame([summary_data])
-        summary_row.insert(0, 'Employee', 'TOTAL')
-
-        df_final = pd.concat([df_filtered, summary_row], ignore_index=True)
-
-        # Format output
-        for col in df_final.columns:
-            if col == 'Employee':
-                continue
-            elif col in ['GP', 'GP Per Smart', 'Projected GP']:
-                df_final[col] = df_final[col].apply(lambda x: f"${float(x):,.2f}" if float(x) != 0 else "$0")
-            elif col == 'Ratio':
-                df_final[col] = df_final[col].apply(lambda x: f"{float(x):.0f}%")
-            elif col == 'Premium Unlimited':
-                df_final[col] = df_final[col].apply(
-                    lambda x: f"{float(x):.0f}%" if float(x) > 1 else f"{float(x) * 100:.0f}%"
-                )
-            elif col in ['Perks', 'VMP']:
-                df_final[col] = df_final[col].apply(lambda x: f"{round(float(x), 2)}")
-            else:
-                df_final[col] = df_final[col].apply(lambda x: f"{int(float(x))}" if float(x).is_integer() else f"{round(float(x), 2)}")
-
-        df_final.drop(columns=[col for col in ['SMT Qty', 'VZ FWA GA', 'VZ FIOS GA'] if col in df_final.columns], inplace=True)
-
-        # Thresholds
-        thresholds = {
-            'Ratio': {'value': 50, 'higher_is_better': True},
-            'SMB GA': {'value': 3, 'higher_is_better': True},
-            'Perks': {'value': 56, 'higher_is_better': True},
-            'VMP': {'value': 55, 'higher_is_better': True},
-            'Premium Unlimited': {'value': 65, 'higher_is_better': True},
-            'SMT GA': {'value': 30, 'higher_is_better': True},
-            'GP Per Smart': {'value': 460, 'higher_is_better': True},
-            'VHI/FIOS': {'value': 7, 'higher_is_better': True},
-            'VZPH': {'value': 2, 'higher_is_better': True},
-            'Verizon Visa': {'value': 1, 'higher_is_better': True}
-        }
-
-        display_columns = ['Employee', 'News', 'Upgrades', 'Ratio', 'SMT GA',
-                           'Perks', 'VMP', 'Premium Unlimited', 'GP',
-                           'GP Per Smart', 'SMB GA', 'VZPH', 'Verizon Visa', 'VHI/FIOS', 'Projected GP']
-        df_final = df_final[display_columns]
-
-        def highlight_thresholds(val, col):
-            try:
-                raw_val = float(str(val).replace('%', '').replace('$', '').replace(',', ''))
-            except:
-                return ''
-            threshold = thresholds.get(col)
-            if not threshold:
-                return ''
-            if threshold['higher_is_better']:
-                return 'background-color: lightgreen' if raw_val >= threshold['value'] else 'background-color: lightcoral'
-            else:
-                return 'background-color: lightgreen' if raw_val <= threshold['value'] else 'background-color: lightcoral'
-
-        def apply_styling(df):
-            styles = pd.DataFrame('', index=df.index, columns=df.columns)
-            for col in df.columns:
-                if col in thresholds:
-                    for idx in df.index:
-                        styles.at[idx, col] = highlight_thresholds(df.at[idx, col], col)
-            return styles
-
-        styled_df = df_final.style.apply(apply_styling, axis=None)
+        if jobs.show_outcome(job, job_key):
+            st.stop()
+        profiler.add_job(job)
+        if locations:
+            store_cube = job.result
+            df_grouped = cube.rollup(store_cube, 'Employee')  # each rep once, across all stores
+        else:
+            df_grouped = job.result.copy()  # the job's frames are shared with other reruns
+
+        # Projection settings: an explicit as-of date keeps projections reproducible
+        col_date, col_method = st.columns(2)
+        as_of = col_date.date_input("📅 As-of date", value=datetime.today().date())
+        method = col_method.selectbox("🔮 Projection method", list(projection.METHODS),
+                                      format_func=projection.METHODS.get)
+        curve = None
+        if method == 'curve':
+            curve = projection.daily_curve(history.metric_totals('tuesdaycall', 'GP'))
+            if curve is None:
+                st.warning("⚠️ No completed months in the history yet; projecting by calendar days.")
+                method = 'calendar'
+
+        # Derived metrics + projection, then the TOTAL row
+        days_elapsed, days_in_month = pipelines.month_progress(as_of)
+        with profiler.stage("derived metrics") as stage:
+            df_filtered, df_values = pipelines.tuesday_table(
+                pipelines.add_tuesday_metrics(df_grouped, as_of, method, curve)
+            )
+            stage["rows"] = len(df_values)
+
+        # Format output and highlight goals from the numeric values
+        # Values stay numeric; currency/percent formatting is applied at render time
+        with profiler.stage("format"):
+            df_final = pipelines.tuesday_display(df_values)
+        with profiler.stage("styling"):
+            styled_df = pipelines.style_tuesday(df_final).format(display.styler_formats(display.TUESDAY))
 
         st.subheader("📄 Performance Table with Goals & Totals")
-        st.dataframe(styled_df, use_container_width=True)
+        with profiler.stage("render table"):
+            st.dataframe(styled_df, use_container_width=True)
 
         # GP Summary
-        total_gp = df_filtered['GP'].sum()
+        total_gp = money.total(df_filtered['GP'])
         daily_avg_gp = total_gp / days_elapsed
-        projected_gp = daily_avg_gp * days_in_month
+        projected_gp = money.total(df_filtered['Projected GP'])
 
         st.markdown(f"""
 ### 💡 GP Summary
 
 - **Total GP**: `${total_gp:,.2f}`
-- **Daily Average GP** (as of {today.strftime('%B %d')}): `${daily_avg_gp:,.2f}`
-- **Projected Monthly GP** (for {today.strftime('%B')}): `${projected_gp:,.2f}`
+- **Daily Average GP** (as of {as_of.strftime('%B %d')}): `${daily_avg_gp:,.2f}`
+- **Projected Monthly GP** (for {as_of.strftime('%B')}, {projection.METHODS[method].lower()}): `${projected_gp:,.2f}`
 """)
 
         # Export button
-        csv = df_final.to_csv(index=False).encode('utf-8')
+        csv = df_final.round(2).to_csv(index=False).encode('utf-8')
         st.download_button(
             label="⬇️ Download CSV Report",
             data=csv,
@@ -217,5 +129,31 @@ if uploaded_file is not None:
             mime='text/csv'
         )
 
+        # Built when clicked, not on every rerun
+        display.excel_download("⬇️ Download Excel Report", "sales_performance_summary.xlsx",
+                               'tuesday_workbook', df_values)
+
+        # ========================== #
+        # 🏬 Store Rollups
+        # ========================== #
+        if locations:
+            st.divider()
+            cube.render_drilldown(store_cube, as_of=as_of, method=method, curve=curve)
+
+        # ========================== #
+        # 🗃️ Monthly History
+        # ========================== #
+        st.divider()
+        history.render_panel('tuesdaycall', df_filtered, digest, as_of,
+                             mean_metrics=pipelines.TUESDAY_AVERAGE_COLUMNS, on_save=leaderboard.update)
+
+        # ========================== #
+        # 🏆 Leaderboards
+        # ========================== #
+        st.divider()
+        leaderboard.render_panel('tuesdaycall')
+
     except Exception as e:
         st.error(f"❌ File processing error: {e}")
+
+    profiler.render()
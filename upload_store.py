@@ -0,0 +1,157 @@
+# ======================================================
+# 🗄️ CONTENT-ADDRESSED UPLOAD STORE
+# ======================================================
+# Keeps a copy of uploaded exports on disk under their sha256 digest, so
+# two managers uploading different "KPI Details.csv" files never collide
+# and the same export uploaded twice is stored once. The store is bounded:
+# files older than MAX_AGE_SECONDS go first, then the least recently used
+# ones until the total fits in MAX_BYTES.
+#
+# The store also backs the session's shared upload: pages of app.py keep
+# only the digest of the last export in st.session_state, so an export
+# uploaded on one page is available on the others without a second copy.
+# The other pages get the stored file's path rather than its bytes; it is
+# only read when the parse cache (load_data) and the job registry no
+# longer have it.
+# Before a page parses an upload, require_page checks its header and, for
+# an export meant for another page, names that page as app.py's menu does.
+
+import os
+import tempfile
+import time
+
+import streamlit as st
+
+import ingest
+import menu
+
+STORE_DIR = os.environ.get("WZM_UPLOAD_STORE", os.path.join(tempfile.gettempdir(), "wzm_uploads"))
+MAX_BYTES = int(os.environ.get("WZM_UPLOAD_STORE_BYTES", 256 * 2**20))
+MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Parse cache eviction policy: at most this many parsed exports, each kept an hour
+CACHE_MAX_ENTRIES = 32
+CACHE_TTL_SECONDS = 60 * 60
+
+
+def store_path(digest, root=STORE_DIR):
+    return os.path.join(root, f"{digest}.csv")
+
+
+def put(data, digest=None, root=STORE_DIR, max_bytes=MAX_BYTES, max_age=MAX_AGE_SECONDS):
+    # Returns (digest, already_stored)
+    digest = digest or ingest.file_digest(data)
+    path = store_path(digest, root)
+
+    if os.path.exists(path):
+        os.utime(path)  # mark as recently used
+        return digest, True
+
+    os.makedirs(root, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=root, suffix=".part")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    evict(root, max_bytes, max_age)
+    return digest, False
+
+
+def remove(path):
+    # Another session may have evicted it first
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def evict(root=STORE_DIR, max_bytes=MAX_BYTES, max_age=MAX_AGE_SECONDS):
+    now = time.time()
+    entries = []
+    for entry in os.scandir(root):
+        if not entry.name.endswith(".csv"):
+            continue
+        stat = entry.stat()
+        if now - stat.st_mtime > max_age:
+            remove(entry.path)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    # Least recently used first
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def shared_upload(label):
+    # Returns (source, digest) for the session's current export, or None:
+    # the bytes of a new upload, or the stored path of one carried over from
+    # another page. A new upload on any page replaces it.
+    uploaded = st.file_uploader(label, type=["csv"])
+    if uploaded is not None:
+        data = uploaded.getvalue()
+        digest, seen_before = put(data)
+        current = st.session_state.get("shared_upload")
+        if seen_before and (current is None or current["digest"] != digest):
+            st.caption("🔁 This export was uploaded before; reusing the stored copy.")
+        st.session_state["shared_upload"] = {"name": uploaded.name, "digest": digest}
+        return data, digest
+
+    current = st.session_state.get("shared_upload")
+    if current is None:
+        return None
+    path = store_path(current["digest"])
+    if not os.path.exists(path):  # evicted since
+        del st.session_state["shared_upload"]
+        return None
+
+    col_note, col_clear = st.columns([4, 1])
+    col_note.caption(f"📎 Using **{current['name']}**, uploaded earlier in this session.")
+    if col_clear.button("✖️ Clear", key="clear_shared_upload"):
+        del st.session_state["shared_upload"]
+        st.rerun()
+    return path, current["digest"]
+
+
+# The digest is the cache key; the bytes (or stored path) are passed unhashed
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _load_cached(digest, page, _source):
+    return ingest.parse_export(_source, page)
+
+
+def load_data(source, page, digest=None):
+    # Parsed once per export content for every session; digest is required
+    # when source is a path
+    return _load_cached(digest or ingest.file_digest(source), page, source)
+
+
+# ======================================================
+# 🧭 WRONG-EXPORT ROUTING
+# ======================================================
+
+def routing_hint(matches):
+    # Where a wrong upload belongs, for the report pages
+    titles = [menu.PAGES[page]['title'] for page in menu.REPORT_PAGES if page in matches]
+    if not titles:
+        return None
+    return f"This looks like the export for the **{' / '.join(titles)}** page; open it there (the upload carries over)."
+
+
+def require_page(source, page):
+    # Checks the header before any parsing; stops the page with the missing
+    # columns, and where the export belongs, when it isn't this page's
+    matches, missing = ingest.sniff(source)
+    if page in matches:
+        return
+    st.error(f"❌ Required columns are missing: {', '.join(missing[page])}")
+    hint = routing_hint(matches)
+    if hint:
+        st.info(f"💡 {hint}")
+    st.stop()